@@ -97,3 +97,17 @@ Data path: {current_data_path}
         table.add_row("satrain/" + str(rel_path), str(n_files))
 
     rich.print(table)
+
+
+@satrain.command(name="convert_to_zarr")
+@click.argument("files", nargs=-1)
+@click.option("--tile_size", default=256, help="Size of the spatial chunks.")
+def convert_to_zarr(files: List[str], tile_size: int):
+    """
+    Convert satrain NetCDF4 files to Zarr stores chunked by channel.
+    """
+    from satrain.utils import convert_to_zarr
+
+    for path in files:
+        zarr_store = convert_to_zarr(Path(path), tile_size=tile_size)
+        LOGGER.info("Converted %s to %s.", path, zarr_store)
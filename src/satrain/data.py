@@ -4,6 +4,7 @@ satrain.data
 
 Provides functionality to access and download the SatRain data.
 """
+import atexit
 from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
 from functools import cache
@@ -13,16 +14,36 @@ import logging
 import multiprocessing
 import os
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
+import posixpath
+import shutil
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Tuple, Union
 import re
+import uuid
 
 import click
 import numpy as np
-import requests
 #from requests_cache import CachedSession
 from requests import Session
+from requests.adapters import HTTPAdapter
 from rich.progress import Progress
+from urllib3.util.retry import Retry
 import xarray as xr
+import zstandard
+
+try:
+    import deflate
+except ImportError:
+    deflate = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
 
 from satrain.definitions import (
     ALL_INPUTS,
@@ -43,9 +64,14 @@ _TESTING = False
 def enable_testing() -> None:
     """
     Enable test mode.
+
+    Since the dataset file listings depend on the test mode, this clears the cached
+    listings.
     """
     global _TESTING
     _TESTING = True
+    get_files_in_dataset.cache_clear()
+    get_files_subset.cache_clear()
 
 
 def get_data_url(dataset_name: str) -> str:
@@ -68,12 +94,14 @@ def get_data_url(dataset_name: str) -> str:
     )
 
 
-FILE_REGEXP = re.compile(r'a href="([\w_]*\.nc)"')
-
-
 def load_json_maybe_gzipped(path: Path):
     """
-    Loads a JSON file, handling both plain and gzipped (.gz) files.
+    Loads a JSON file, handling plain, zstd-compressed (.zst), and gzipped (.gz) files.
+
+    The file is read into memory in one go. Gzipped files are decompressed using
+    libdeflate if the 'deflate' package is available and the standard library's
+    gzip module otherwise. Similarly, the JSON is parsed using 'orjson' if it is
+    available.
 
     Parameters:
         path: A Path object pointing to the file to read.
@@ -81,11 +109,73 @@ def load_json_maybe_gzipped(path: Path):
     Returns:
         The deserialized Python object.
     """
-    filename = path.name
-    open_fn = gzip.open if filename.endswith(".gz") else open
-    mode = 'rt' if filename.endswith(".gz") else 'r'
-    with open_fn(path, mode, encoding='utf-8') as f:
-        return json.load(f)
+    path = Path(path)
+    data = path.read_bytes()
+    if path.name.endswith(".zst"):
+        data = zstandard.ZstdDecompressor().decompress(data)
+    elif path.name.endswith(".gz"):
+        if deflate is not None:
+            data = deflate.gzip_decompress(data)
+        else:
+            data = gzip.decompress(data)
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+MANIFEST_REGEXP = re.compile(r"^files_(.+?)(_test)?\.json(\.zst|\.gz)?$")
+MANIFEST_SUFFIXES = ["", ".zst", ".gz"]
+
+
+def find_manifests(path: Path) -> Dict[Tuple[str, bool], Path]:
+    """
+    Find the files listing the files in each dataset.
+
+    If multiple versions of the same listing exist, plain JSON is preferred over
+    zstd-compressed and gzipped JSON.
+
+    Args:
+        path: The directory containing the file listings.
+
+    Return:
+        A dictionary mapping tuples ``(dataset_name, testing)`` to the path of the
+        corresponding file listing.
+    """
+    manifests = {}
+    with os.scandir(path) as entries:
+        for entry in entries:
+            match = MANIFEST_REGEXP.match(entry.name)
+            if match is None:
+                continue
+            name, test, suffix = match.groups()
+            key = (name, test is not None)
+            rank = MANIFEST_SUFFIXES.index(suffix or "")
+            if key not in manifests or rank < manifests[key][0]:
+                manifests[key] = (rank, Path(entry.path))
+    return {key: path for key, (_, path) in manifests.items()}
+
+
+_MANIFEST_PATHS = find_manifests(Path(__file__).parent / "files")
+
+
+def get_manifest_path(dataset_name: str) -> Path:
+    """
+    Get the path of the file listing all files in a given dataset.
+
+    Args:
+        dataset_name: The name of the dataset, i.e., 'satrain' for the Satellite
+            Rain Estimation and Detection (SatRain) benchmar dataset.
+
+    Return:
+        A Path object pointing to the plain, zstd-compressed or gzipped JSON file
+        listing the files in the dataset.
+    """
+    path = _MANIFEST_PATHS.get((dataset_name.lower(), _TESTING))
+    if path is None:
+        raise ValueError(
+            f"Unknown dataset name: {dataset_name}"
+        )
+    return path
 
 
 @cache
@@ -98,37 +188,195 @@ def get_files_in_dataset(dataset_name: str) -> Dict[str, Any]:
             Rain Estimation and Detection (SatRain) benchmar dataset.
 
     Return:
-        A nested dictionary containing all files in the dataset.
+        A nested dictionary containing all files in the dataset. The result is cached
+        and shared between calls and must therefore not be modified.
     """
-    if _TESTING:
-        fname = f"files_{dataset_name.lower()}_test.json"
-        path = Path(__file__).parent / "files" / fname
-        if not path.exists():
-            path = Path(__file__).parent / "files" / (fname + ".gz")
-    else:
-        fname = f"files_{dataset_name.lower()}.json"
-        path = Path(__file__).parent / "files" / fname
-        if not path.exists():
-            path = Path(__file__).parent / "files" / (fname + ".gz")
+    files = load_json_maybe_gzipped(get_manifest_path(dataset_name))
+    return files
+
 
-    files = load_json_maybe_gzipped(path)
+@cache
+def get_files_subset(dataset_name: str, keys: Tuple[str, ...]) -> List[str]:
+    """
+    Lists the files in a single branch of the nested dictionary of dataset files.
+
+    If the 'ijson' package is available, the file list is streamed from the
+    manifest so that only the requested branch is deserialized. Otherwise, the
+    branch is extracted from the result of 'get_files_in_dataset'.
+
+    Args:
+        dataset_name: The name of the dataset, i.e., 'satrain' for the Satellite
+            Rain Estimation and Detection (SatRain) benchmar dataset.
+        keys: A tuple of keys identifying the branch, e.g.,
+            ('gmi', 'training', 'xl', 'gridded', 'gmi').
+
+    Return:
+        A list containing the relative paths of the files in the requested branch
+        or an empty list if the branch doesn't exist.
+    """
+    if ijson is None:
+        files = get_files_in_dataset(dataset_name)
+        for key in keys:
+            files = files.get(key, {})
+        return list(files)
+
+    path = get_manifest_path(dataset_name)
+    with open(path, "rb") as inpt:
+        if path.name.endswith(".zst"):
+            inpt = zstandard.ZstdDecompressor().stream_reader(inpt)
+        elif path.name.endswith(".gz"):
+            inpt = gzip.GzipFile(fileobj=inpt)
+        return _stream_branch(ijson.parse(inpt), keys)
+
+
+def _stream_branch(events: Iterator[Tuple[str, str, Any]], keys: Tuple[str, ...]) -> List[str]:
+    """
+    Collect the elements of the list at a given branch of a stream of ijson parser
+    events. The stream is only consumed until the branch, or one of the maps that
+    would contain it, has been read completely.
+
+    Args:
+        events: An iterator over the '(prefix, event, value)' tuples produced by
+            'ijson.parse'.
+        keys: A tuple of keys identifying the branch.
+
+    Return:
+        A list containing the elements of the branch or an empty list if the branch
+        doesn't exist.
+    """
+    prefix = ".".join(keys)
+    item_prefix = prefix + ".item"
+    ancestors = {".".join(keys[:ind]) for ind in range(1, len(keys))}
+    files = []
+    for event_prefix, event, value in events:
+        if event_prefix == item_prefix:
+            if event not in ("start_array", "end_array", "start_map", "end_map", "map_key"):
+                files.append(value)
+        elif event_prefix == prefix and event == "end_array":
+            break
+        elif event == "end_map" and event_prefix in ancestors:
+            break
     return files
 
 
-def download_file(url: str, destination: Path) -> None:
+# Downloads are I/O-bound so the number of concurrent requests is not limited
+# by the number of CPUs.
+N_THREADS = min(4 * multiprocessing.cpu_count(), 16)
+
+
+def create_session(n_connections: int = N_THREADS) -> Session:
+    """
+    Create a HTTP session for downloading files from the SatRain server.
+
+    The session keeps connections alive across requests so that downloading many
+    small files doesn't require a new connection for every file.
+
+    Args:
+        n_connections: The number of connections to keep in the connection pool.
+            Should match the number of threads used to download files.
+
+    Return:
+        A requests.Session object with retrying and connection pooling enabled.
+    """
+    session = Session()
+    # Connection errors are already retried by 'download_files', so only
+    # transient server errors are retried here.
+    retry = Retry(
+        total=3,
+        connect=0,
+        read=0,
+        backoff_factor=0.5,
+        status_forcelist=[500, 502, 503, 504]
+    )
+    adapter = HTTPAdapter(
+        pool_connections=n_connections,
+        pool_maxsize=n_connections,
+        max_retries=retry
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+_SESSION = create_session()
+_POOL = ThreadPoolExecutor(max_workers=N_THREADS)
+
+
+def _reset_pool() -> None:
+    """
+    Replace the download thread pool and HTTP session. Used in forked child
+    processes, which don't inherit the worker threads of the parent's pool and
+    must not share its pooled connections.
+    """
+    global _POOL, _SESSION
+    _POOL = ThreadPoolExecutor(max_workers=N_THREADS)
+    _SESSION = create_session()
+
+
+def _shutdown_pool() -> None:
+    """
+    Shut down the download thread pool.
+    """
+    _POOL.shutdown(wait=True)
+
+
+atexit.register(_shutdown_pool)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_pool)
+
+
+def preallocate(output: BinaryIO, headers: Dict[str, str]) -> None:
+    """
+    Reserve disk space for a downloaded file.
+
+    Allocating the full file size upfront avoids the file system having to
+    extend the file with every write. This is only done on platforms supporting
+    'posix_fallocate' and if the size of the decoded response is known.
+
+    Args:
+        output: The file object to which the response will be written.
+        headers: The headers of the server response.
+    """
+    if not hasattr(os, "posix_fallocate"):
+        return
+    if "Content-Length" not in headers or "Content-Encoding" in headers:
+        return
+    try:
+        size = int(headers["Content-Length"])
+        if size > 0:
+            os.posix_fallocate(output.fileno(), 0, size)
+    except (ValueError, OSError):
+        pass
+
+
+def download_file(url: str, destination: Path, session: Optional[Session] = None) -> None:
     """
     Download file from server.
 
     Args:
         url: A string containing the URL of the file to download.
         destination: The destination to which to write the file.
+        session: An optional requests.Session to use for the download. If not given,
+            the module-wide session will be used.
     """
-    with requests.get(url, stream=True) as response:
+    if session is None:
+        session = _SESSION
+    with session.get(url, stream=True) as response:
         response.raise_for_status()
-        with open(destination, "wb") as output:
-            for chunk in response.iter_content(chunk_size=8192):
-                if chunk:
-                    output.write(chunk)
+        response.raw.decode_content = True
+        # Write to a temporary file so that failed downloads never leave a partial or
+        # preallocated, zero-filled file at the destination. The file is created with
+        # 'open' rather than 'tempfile' so that its permissions follow the umask.
+        part = destination.with_name(f"{destination.name}.{uuid.uuid4().hex[:8]}.part")
+        try:
+            with open(part, "xb") as output:
+                preallocate(output, response.headers)
+                shutil.copyfileobj(response.raw, output, length=1 << 20)
+                output.truncate()
+            os.replace(part, destination)
+        except BaseException:
+            part.unlink(missing_ok=True)
+            raise
 
 
 @contextmanager
@@ -149,6 +397,7 @@ def download_files(
         destination: Path,
         progress_bar: bool = True,
         retries: int = 3,
+        n_threads: Optional[int] = None,
 ) -> List[str]:
     """
     Download files using multiple threads.
@@ -159,36 +408,42 @@ def download_files(
         destination: A Path object pointing to the local path to which to download the files.
         progress_bar: Whether or not to display a progress bar during download.
         retries: The number of retries to perform for failed files.
+        n_threads: The number of concurrent downloads. Defaults to 'N_THREADS', in which
+            case the module-wide thread pool and session are used.
 
     Return:
         A list of the downloaded files.
     """
-    n_threads = min(multiprocessing.cpu_count(), 8)
-    pool = ThreadPoolExecutor(max_workers=n_threads)
+    if len(files) == 0:
+        return []
+
+    if n_threads is None or n_threads == N_THREADS:
+        pool = _POOL
+        session = _SESSION
+    else:
+        pool = ThreadPoolExecutor(max_workers=n_threads)
+        session = create_session(n_threads)
     ctr = 0
 
+    downloaded = []
     failed = []
 
-    if progress_bar and len(files) > 0:
-        progress = Progress(console=satrain.logging.get_console())
-    else:
-        progress = None
+    # Files share only a small number of parent directories, so create them upfront.
+    for rel_dir in {posixpath.dirname(path) for path in files}:
+        (destination / rel_dir).mkdir(parents=True, exist_ok=True)
+
+    rel_path = "/".join(next(iter(files)).split("/")[:3])
 
     while ctr < retries and len(files) > 0:
 
         tasks = []
         failed = []
         for path in files:
-            *path, fname = path.split("/")
-            path = "/".join(path)
-            output_path = destination / path
-            output_path.mkdir(parents=True, exist_ok=True)
-            url = base_url + "/" + str(path) + "/" + fname
-            tasks.append(pool.submit(download_file, url, output_path / fname))
+            url = base_url + "/" + path
+            tasks.append(pool.submit(download_file, url, destination / path, session))
 
         with progress_bar_or_not(progress_bar=progress_bar) as progress:
             if progress is not None:
-                rel_path = "/".join(next(iter(files)).split("/")[:3])
                 bar = progress.add_task(
                     f"Downloading files from {rel_path}:", total=len(files)
                 )
@@ -199,18 +454,23 @@ def download_files(
 
                 try:
                     task.result()
+                    downloaded.append(path)
                     if progress is not None:
                         progress.advance(bar, advance=1)
                 except Exception:
                     LOGGER.exception(
                         "Encountered an error when trying to download files %s.",
-                        path.split("/")[-1],
+                        posixpath.basename(path),
                     )
                     failed.append(path)
 
         ctr += 1
         files = failed
 
+    if pool is not _POOL:
+        pool.shutdown()
+        session.close()
+
     if len(failed) > 0:
         LOGGER.warning(
             "The download of the following files failed: %s. If the issue persists please consider "
@@ -218,7 +478,7 @@ def download_files(
             failed,
         )
 
-    return [fle for fle in files if fle not in failed]
+    return downloaded
 
 
 def download_missing(
@@ -262,30 +522,30 @@ def download_missing(
         check_consistency=False
     )
     local_files = map(str, local_files.get(source, []))
-    all_files = get_files_in_dataset(dataset_name)
     if split.lower() == "testing":
-        all_files = all_files[base_sensor][split][domain][geometry].get(source, [])
+        keys = (base_sensor, split, domain, geometry, source)
     else:
-        all_files = all_files[base_sensor][split][subset][geometry].get(source, [])
+        keys = (base_sensor, split, subset, geometry, source)
+    all_files = get_files_subset(dataset_name, keys)
 
     missing = set(all_files) - set(local_files)
+    if len(missing) == 0:
+        return []
 
-    if 0 < len(missing):
-        LOGGER.info(
-            "Downloading %s files for base_sensor %s, split %s, and geometry %s.",
-            len(missing),
-            base_sensor,
-            split,
-            geometry
-        )
-        downloaded = download_files(
-            get_data_url(dataset_name),
-            missing,
-            destination,
-            progress_bar=progress_bar
-        )
-        return [destination / fle for fle in downloaded]
-    return []
+    LOGGER.info(
+        "Downloading %s files for base_sensor %s, split %s, and geometry %s.",
+        len(missing),
+        base_sensor,
+        split,
+        geometry
+    )
+    downloaded = download_files(
+        get_data_url(dataset_name),
+        missing,
+        destination,
+        progress_bar=progress_bar
+    )
+    return [destination / fle for fle in downloaded]
 
 
 def download_dataset(
@@ -361,6 +621,40 @@ def download_dataset(
     return paths
 
 
+LOCAL_FILE_REGEXP = re.compile(r"^(.+)_(\d{14})\.nc$")
+
+
+def scan_local_files(path: Path) -> Dict[str, List[str]]:
+    """
+    Find all SatRain files in a directory tree.
+
+    The directory tree is traversed once and the files are grouped by the source
+    name preceding the time stamp in their filename.
+
+    Args:
+        path: The root of the directory tree to search.
+
+    Return:
+        A dictionary mapping source names to lists of the paths of the corresponding
+        files. The files are not sorted.
+    """
+    files = {}
+    if not path.is_dir():
+        return files
+
+    dirs = [str(path)]
+    while len(dirs) > 0:
+        with os.scandir(dirs.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir():
+                    dirs.append(entry.path)
+                elif entry.is_file():
+                    match = LOCAL_FILE_REGEXP.match(entry.name)
+                    if match is not None:
+                        files.setdefault(match.group(1), []).append(entry.path)
+    return files
+
+
 def get_local_files(
         dataset_name: str,
         base_sensor: str,
@@ -370,7 +664,7 @@ def get_local_files(
         domain: str = "conus",
         relative_to: Optional[Path] = None,
         data_path: Optional[Path] = None,
-        check_consistency: bool = True
+        check_consistency: Optional[bool] = None
 ) -> Dict[str, Path]:
     """
     Get all locally available files.
@@ -384,7 +678,9 @@ def get_local_files(
         relative_to: If given, file paths will be relative to the given path
             rather than absolute.
         data_path: The root directory containing IPWG data.
-        check_consitency: Whether or not to check consistency of the found files.
+        check_consitency: Whether or not to check consistency of the found files. If 'None',
+            the check is only performed if the 'SATRAIN_CHECK_CONSISTENCY' environment
+            variable is set.
 
     Return:
         A dictionary mapping data source names to the corresponding files.
@@ -393,34 +689,42 @@ def get_local_files(
         data_path = config.get_data_path()
     else:
         data_path = Path(data_path)
-    files = {}
+    if split != "testing":
+        rel_paths = [
+            f"{dataset_name}/{base_sensor}/{split}/{SIZES[size_ind]}/{geometry}/"
+            for size_ind in range(SIZES.index(subset) + 1)
+        ]
+    else:
+        rel_paths = [f"{dataset_name}/{base_sensor}/{split}/{domain}/{geometry}/"]
+
+    # The directory trees are independent, so scan them concurrently to hide the
+    # latency of network file systems.
+    split_paths = [data_path / rel_path for rel_path in rel_paths]
+    if len(split_paths) > 1:
+        with ThreadPoolExecutor(max_workers=len(split_paths)) as pool:
+            scans = list(pool.map(scan_local_files, split_paths))
+    else:
+        scans = [scan_local_files(split_path) for split_path in split_paths]
+
     sources = ["ancillary", "geo", "geo_t", "geo_ir", "geo_ir_t", "target"]
-    for source in [base_sensor,] + sources:
-        files[source] = []
-        if split != "testing":
-            for size_ind in range(SIZES.index(subset) + 1):
-                rel_path = f"{dataset_name}/{base_sensor}/{split}/{SIZES[size_ind]}/{geometry}/"
-                split_path = data_path / rel_path
-                source_files = sorted(list(split_path.glob(f"**/{source}_??????????????.nc")))
-                if relative_to is not None:
-                    source_files = [path.relative_to(relative_to) for path in source_files]
-                files[source] += source_files
-        else:
-            rel_path = f"{dataset_name}/{base_sensor}/{split}/{domain}/{geometry}/"
-            split_path = data_path / rel_path
-            source_files = sorted(list(split_path.glob(f"**/{source}_??????????????.nc")))
+    files = {source: [] for source in [base_sensor,] + sources}
+    for scanned in scans:
+        for source in files:
+            source_files = sorted([Path(path) for path in scanned.get(source, [])])
             if relative_to is not None:
                 source_files = [path.relative_to(relative_to) for path in source_files]
             files[source] += source_files
 
-    if check_consistency:
-        ref_times = set([get_median_time(path) for path in files["target"]])
+    if check_consistency is None:
+        check_consistency = bool(os.environ.get("SATRAIN_CHECK_CONSISTENCY"))
+
+    if __debug__ and check_consistency:
+        ref_times = {get_median_time(path.name) for path in files["target"]}
         for source in [base_sensor,] + sources:
-            if len(ref_times) == 0 or len(files[source]) == 0:
+            if source == "target" or len(ref_times) == 0 or len(files[source]) == 0:
                 continue
-            ref_times = set(ref_times)
-            source_times = set([get_median_time(path) for path in files[source]])
-            assert set(ref_times) == source_times
+            source_times = {get_median_time(path.name) for path in files[source]}
+            assert ref_times == source_times
 
     return files
 
@@ -603,14 +907,21 @@ def list_local_files_rec(path: Path) -> Dict[str, Any]:
         A dictionary containing all sub-directories
 
     """
-    netcdf_files = sorted(list(path.glob("*.nc")))
+    netcdf_files = []
+    children = []
+    with os.scandir(path) as entries:
+        for entry in entries:
+            if entry.is_dir():
+                children.append(entry)
+            elif entry.name.endswith(".nc"):
+                netcdf_files.append(entry.path)
+
     if len(netcdf_files) > 0:
-        return netcdf_files
+        return sorted([Path(fle) for fle in netcdf_files])
 
     files = {}
-    for child in path.iterdir():
-        if child.is_dir():
-            files[child.name] = list_local_files_rec(child)
+    for child in children:
+        files[child.name] = list_local_files_rec(Path(child.path))
     return files
 
 
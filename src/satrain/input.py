@@ -49,25 +49,337 @@ Members
 """
 from abc import ABC, abstractproperty
 from copy import copy
-from functools import cached_property
-import gc
+from functools import lru_cache, singledispatch
 from pathlib import Path
-from dataclasses import dataclass, asdict
-from typing import Any, Dict, List, Optional, Union
+from dataclasses import dataclass, fields
+from typing import Any, Dict, List, Optional, Tuple, Union
 
-import hdf5plugin
+import h5py
 import numpy as np
 import xarray as xr
 
+try:
+    import numba
+except ImportError:
+    numba = None
+
 from satrain.definitions import ANCILLARY_VARIABLES
-from satrain.utils import open_if_required
+
+
+STATS_DIR = Path(__file__).parent / "files" / "stats"
+STATS_VARIABLES = ["mean", "std_dev", "min", "max"]
+# Files smaller than this size are read into memory in a single read when opened with h5py.
+CORE_DRIVER_MAX_SIZE = 1 << 20
+
+
+@lru_cache(maxsize=None)
+def _load_stats(name: str) -> Dict[str, np.ndarray]:
+    """
+    Load summary statistics from one of the statistics files included in satrain.
+
+    Args:
+        name: The name of the statistics file without the '.nc' extension.
+
+    Return:
+        A dictionary mapping the names 'mean', 'std_dev', 'min', 'max' to read-only float32
+        arrays containing the corresponding statistics of all features in the file.
+    """
+    path = STATS_DIR / f"{name}.nc"
+    driver = "core" if path.stat().st_size < CORE_DRIVER_MAX_SIZE else None
+    stats = {}
+    with h5py.File(path, "r", driver=driver) as stats_file:
+        for var in STATS_VARIABLES:
+            stat = np.asarray(stats_file[var][()], dtype=np.float32)
+            stat.setflags(write=False)
+            stats[var] = stat
+    return stats
+
+
+@lru_cache(maxsize=None)
+def _load_seviri_lut() -> xr.Dataset:
+    """
+    Load the lookup table used to remap SEVIRI observations to the distribution of
+    the corresponding GOES channels. The table is loaded once and shared by all
+    SEVIRI inputs, which select their channels from it.
+    """
+    return xr.load_dataset(STATS_DIR / "seviri_lut.nc", engine="h5netcdf")
+
+
+@lru_cache(maxsize=None)
+def _select_stats_cached(
+        name: str,
+        features: Optional[int | Tuple[int, ...]]
+) -> Dict[str, np.ndarray]:
+    """
+    Cached implementation of '_select_stats' that requires hashable arguments.
+    """
+    stats = _load_stats(name)
+    if features is not None:
+        if isinstance(features, tuple):
+            features = list(features)
+        stats = {var: stat[features] for var, stat in stats.items()}
+    for stat in stats.values():
+        stat.setflags(write=False)
+    return stats
+
+
+def _select_stats(
+        name: str,
+        features: Optional[Any] = None
+) -> Dict[str, np.ndarray]:
+    """
+    Select the statistics of a subset of the features in a statistics file.
+
+    The selected statistics are cached so that all inputs with the same configuration
+    share the same read-only arrays.
+
+    Args:
+        name: The name of the statistics file without the '.nc' extension.
+        features: Index or indices of the features to select. If 'None', all features
+            are selected.
+
+    Return:
+        A dictionary mapping the names 'mean', 'std_dev', 'min', 'max' to read-only float32
+        arrays containing the statistics of the selected features.
+    """
+    if features is not None:
+        features = np.asarray(features).tolist()
+        if isinstance(features, list):
+            features = tuple(features)
+    return _select_stats_cached(name, features)
+
+
+# Attributes used by the NetCDF4 library to represent dimensions in HDF5 files.
+_NETCDF_INTERNAL_ATTRS = {
+    "CLASS", "DIMENSION_LIST", "NAME", "REFERENCE_LIST", "_Netcdf4Coordinates", "_Netcdf4Dimid",
+    "_nc3_strict"
+}
+
+
+def _read_h5_var(
+        path: Path,
+        name: str,
+        indexers: Optional[Dict[str, Any]] = None,
+        dims: Optional[Tuple[Any, ...]] = None
+) -> np.ndarray:
+    """
+    Read a variable from a NetCDF4 file using h5py.
+
+    Only the hyperslab spanning the selected elements is read from the file.
+    The data is decoded following the CF conventions in the same way as
+    xarray does it.
+
+    Note:
+        HDF5 decompresses every chunk that intersects the selection. Reading
+        channel subsets is therefore cheapest for files chunked with a single
+        channel per chunk, i.e., chunks of shape (H, W, 1) for observations
+        stored with the channel dimension last. For such files, sparse index
+        lists along the chunked dimension are passed to h5py directly so that
+        the chunks in between the selected indices are not read.
+
+    Args:
+        path: A Path object pointing to a NetCDF4 file.
+        name: The name of the variable to read.
+        indexers: An optional dictionary mapping dimension names to an integer index,
+            a list of integer indices, or a slice to select along that dimension.
+        dims: An optional tuple of dimension names defining the order of the dimensions
+            of the returned array. May contain '...' to represent all remaining dimensions.
+
+    Return:
+        A numpy array containing the decoded data.
+    """
+    if indexers is None:
+        indexers = {}
+
+    with h5py.File(path, "r") as h5_file:
+        var = h5_file[name]
+        var_dims = [dim[0].name.rsplit("/", 1)[-1] for dim in var.dims]
+
+        h5_sel = []
+        takes = []
+        drops = []
+        fancy = False
+        for axis, dim in enumerate(var_dims):
+            ind = indexers.get(dim, slice(None))
+            if isinstance(ind, slice):
+                h5_sel.append(ind)
+                continue
+            # Resolve negative indices as xarray's 'isel' does.
+            size = var.shape[axis]
+            ind = np.asarray(ind, dtype=np.int64)
+            if ((ind < -size) | (ind >= size)).any():
+                raise IndexError(
+                    f"Index out of range for dimension '{dim}' of size {size}."
+                )
+            ind = ind % size
+            if ind.ndim == 0:
+                h5_sel.append(slice(int(ind), int(ind) + 1))
+                drops.append(axis)
+            else:
+                uniq, inv = np.unique(ind, return_inverse=True)
+                sparse = uniq.size < uniq[-1] - uniq[0] + 1
+                # h5py supports a single increasing index list per selection.
+                if sparse and not fancy and var.chunks is not None and var.chunks[axis] == 1:
+                    fancy = True
+                    h5_sel.append(uniq.tolist())
+                    inv = inv.reshape(-1)
+                    if uniq.size < ind.size or (inv != np.arange(ind.size)).any():
+                        takes.append((axis, inv))
+                else:
+                    start = uniq[0]
+                    h5_sel.append(slice(start, uniq[-1] + 1))
+                    takes.append((axis, ind - start))
+        data = var[tuple(h5_sel)]
+
+        attrs = {}
+        for attr, value in var.attrs.items():
+            if attr in _NETCDF_INTERNAL_ATTRS:
+                continue
+            if isinstance(value, bytes):
+                value = value.decode()
+            elif isinstance(value, np.ndarray) and value.size == 1:
+                value = value.item()
+            attrs[attr] = value
+
+    for axis, ind in takes:
+        data = np.take(data, ind, axis=axis)
+    if drops:
+        data = data[tuple(0 if axis in drops else slice(None) for axis in range(data.ndim))]
+        var_dims = [dim for axis, dim in enumerate(var_dims) if axis not in drops]
+
+    var = xr.conventions.decode_cf_variable(name, xr.Variable(var_dims, data, attrs))
+    if dims is not None:
+        var = var.transpose(*dims)
+    return var.values
+
+
+def _load_var(
+        path_or_dataset: str | Path | xr.Dataset,
+        name: str,
+        indexers: Optional[Dict[str, Any]] = None,
+        dims: Optional[Tuple[Any, ...]] = None
+) -> np.ndarray:
+    """
+    Load a variable from a NetCDF4 file or an xarray.Dataset.
+
+    Args:
+        path_or_dataset: A path pointing to a NetCDF4 file or Zarr store or an already
+            loaded dataset.
+        name: The name of the variable to load.
+        indexers: An optional dictionary mapping dimension names to the indices to select
+            along that dimension.
+        dims: An optional tuple of dimension names defining the order of the dimensions
+            of the returned array.
+
+    Return:
+        A numpy array containing the selected data.
+    """
+    if isinstance(path_or_dataset, (str, Path)):
+        if Path(path_or_dataset).suffix == ".zarr":
+            with xr.open_zarr(path_or_dataset, chunks=None) as dataset:
+                return np.asarray(_load_var(dataset, name, indexers=indexers, dims=dims))
+        return _read_h5_var(path_or_dataset, name, indexers=indexers, dims=dims)
+    var = path_or_dataset[name]
+    if indexers is not None:
+        var = var[indexers]
+    if dims is not None:
+        var = var.transpose(*dims)
+    return var.data
+
+
+def _broadcast_stat(stat: Any, ndim: int, dtype: np.dtype) -> np.ndarray:
+    """
+    Convert per-channel statistics to an array that broadcasts against
+    channel-first data with 'ndim' dimensions.
+    """
+    stat = np.asarray(stat, dtype=dtype)
+    return stat.reshape(stat.shape + (1,) * (ndim - 1))
+
+
+# Normalization coefficients calculated for the read-only statistics of the input classes.
+_NORMALIZATION_COEFS = {}
+_NORMALIZATION_COEFS_MAX_SIZE = 64
+
+
+def _normalization_coefs(
+        stats: Dict[str, np.ndarray] | xr.Dataset,
+        how: str,
+        ndim: int,
+        dtype: np.dtype
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Calculate the offset and scaling factor for normalizing channel-first data.
+
+    Coefficients derived from read-only statistics, such as those of the input
+    classes, are cached so that they are only calculated once for every number of
+    data dimensions.
+
+    Args:
+        stats: The statistics to use for the normalization.
+        how: The lower-case name of the normalization method.
+        ndim: The number of dimensions of the data to normalize.
+        dtype: The dtype of the normalized data.
+
+    Return:
+        A tuple ``(offset, scale)`` of arrays that broadcast against the data.
+    """
+    key = (id(stats), how, ndim, dtype)
+    cached = _NORMALIZATION_COEFS.get(key)
+    if cached is not None and cached[0] is stats:
+        return cached[1:]
+
+    if how == "standardize":
+        names = ("mean", "std_dev")
+        offset = _broadcast_stat(stats["mean"], ndim, dtype)
+        sigma = _broadcast_stat(stats["std_dev"], ndim, dtype)
+        scale = 1.0 / (sigma + 1e-6)
+    elif how == "minmax":
+        names = ("min", "max")
+        x_max = _broadcast_stat(stats["max"], ndim, dtype)
+        offset = _broadcast_stat(stats["min"], ndim, dtype)
+        scale = 2.0 / (x_max - offset + 1e-6)
+    else:
+        raise ValueError(
+            f"The normalization strategy '{how}' is not supported. Supported strategies are "
+            "'standardize' and 'minmax'."
+        )
+
+    read_only = all(
+        isinstance(stats[name], np.ndarray) and not stats[name].flags.writeable for name in names
+    )
+    if read_only:
+        if len(_NORMALIZATION_COEFS) >= _NORMALIZATION_COEFS_MAX_SIZE:
+            _NORMALIZATION_COEFS.clear()
+        # Keep a reference to the statistics so that their id isn't reused.
+        _NORMALIZATION_COEFS[key] = (stats, offset, scale)
+    return offset, scale
+
+
+if numba is not None:
+    @numba.njit(parallel=True, cache=True)
+    def _normalize_kernel(data, offset, scale, shift, replace_nan, nan, out):
+        """
+        Normalize channel-first data of shape (C, N) and replace NANs in a single pass.
+        """
+        for chan_ind in numba.prange(data.shape[0]):
+            chan_offset = offset[chan_ind]
+            chan_scale = scale[chan_ind]
+            for ind in range(data.shape[1]):
+                val = (data[chan_ind, ind] - chan_offset) * chan_scale - shift
+                if replace_nan and np.isnan(val):
+                    val = nan
+                out[chan_ind, ind] = val
+else:
+    _normalize_kernel = None
 
 
 def normalize(
         data: np.ndarray,
         stats: xr.Dataset,
         how: Optional[str] = None,
-        nan: Optional[float] = None
+        nan: Optional[float] = None,
+        out: Optional[np.ndarray] = None,
+        dtype: Optional[np.dtype] = None
 ) -> np.ndarray:
     """
     Normalize input data and replace missing values.
@@ -78,30 +390,70 @@ def normalize(
         how: A string specifying how to normalize the data. Should be one of
             ['standardize', 'minmax']>
         nan: If given, use this value to replace NAN values in the input.
+        out: An optional array to write the results to. May be 'data' itself to
+            normalize the data in place. If not given, a new array is allocated.
+        dtype: An optional dtype for the normalized data. Passing 'np.float32' avoids
+            processing float64 data in double precision.
 
     Return:
         The give array 'data' normalized according to the given statistics and
         chosen normalization method and, if 'nan' is not None, with NAN values
-        replaced with 'nan'.
+        replaced with 'nan'. Unless 'dtype' is given, floating point data retains
+        its type, while integer data is converted to float32.
     """
+    data = np.asarray(data)
+    if how is None and nan is None and dtype is None:
+        return data
+
+    cast = dtype is not None
+    if cast:
+        dtype = np.dtype(dtype)
+    elif np.issubdtype(data.dtype, np.floating):
+        dtype = data.dtype
+    else:
+        dtype = np.dtype(np.float32)
+
     if how is not None:
-        pad_dims = data.ndim - 1
-        if how.lower() == "standardize":
-            mu = stats["mean"].data.__getitem__((...,) + (None,) * pad_dims)
-            sigma = stats["std_dev"].data.__getitem__((...,) + (None,) * pad_dims)
-            data = (data - mu) / (sigma + 1e-6)
-        elif how.lower() == "minmax":
-            x_max = stats["max"].data.__getitem__((...,) + (None,) * pad_dims)
-            x_min = stats["min"].data.__getitem__((...,) + (None,) * pad_dims)
-            data = 2.0 * (data - x_min) / (x_max - x_min + 1e-6) - 1.0
-        else:
-            raise ValueError(
-                f"The normalization strategy '{how}' is not supported. Supported strategies are "
-                "'standardize' and 'minmax'."
+        how = how.lower()
+        offset, scale = _normalization_coefs(stats, how, data.ndim, dtype)
+        if out is None:
+            out = np.empty(data.shape, dtype=dtype)
+
+        # Use fused kernel for contiguous float32 or float64 data if numba is available.
+        if (
+                _normalize_kernel is not None
+                and data.dtype in (np.float32, np.float64)
+                and out.dtype == data.dtype
+                and data.ndim >= 2
+                and data.flags.c_contiguous
+                and out.flags.c_contiguous
+        ):
+            n_chans = data.shape[0]
+            _normalize_kernel(
+                data.reshape(n_chans, -1),
+                np.ascontiguousarray(np.broadcast_to(offset.reshape(-1), (n_chans,))),
+                np.ascontiguousarray(np.broadcast_to(scale.reshape(-1), (n_chans,))),
+                dtype.type(1.0 if how == "minmax" else 0.0),
+                nan is not None,
+                dtype.type(0.0 if nan is None else nan),
+                out.reshape(n_chans, -1)
             )
+            return out
+
+        np.subtract(data, offset, out=out)
+        np.multiply(out, scale, out=out)
+        if how == "minmax":
+            np.subtract(out, 1.0, out=out)
+        data = out
 
     if nan is not None:
-        data = np.nan_to_num(data, nan=nan, copy=True)
+        if out is None:
+            out = data.astype(dtype) if cast else data.copy()
+        elif out is not data:
+            np.copyto(out, data)
+        data = np.nan_to_num(out, nan=nan, copy=False)
+    elif cast:
+        data = data.astype(dtype, copy=False)
     return data
 
 
@@ -110,6 +462,8 @@ class InputConfig(ABC):
     """
     Base class for input data records used to define what input data to load.
     """
+    __slots__ = ()
+
     @classmethod
     def parse(self, inpt: Union[str, Dict[str, Any], "InputConfig"]) -> "InputConfig":
         """
@@ -129,46 +483,7 @@ class InputConfig(ABC):
         Return:
             An object of an InputConfig sub-class.
         """
-        if isinstance(inpt, InputConfig):
-            return inpt
-        elif isinstance(inpt, str):
-            name = inpt
-            kwargs = {}
-        elif isinstance(inpt, dict):
-            inpt = copy(inpt)
-            name = inpt.pop("name", None)
-            if name is None:
-                raise ValueError(
-                    "If a retrieval input is specified using a dict, it must have an entry "
-                    "'name'."
-                )
-            kwargs = inpt
-        else:
-            raise ValueError(
-                f"Unsupported input for parsing an InputConfig: {inpt}"
-            )
-
-        if name.lower() == "gmi":
-            return GMI(**kwargs)
-        if name.lower() == "atms":
-            return ATMS(**kwargs)
-        elif name.lower() == "ancillary":
-            return Ancillary(**kwargs)
-        elif name.lower() == "geo":
-            return Geo(**kwargs)
-        elif name.lower() == "seviri":
-            return Seviri(**kwargs)
-        elif name.lower() == "seviri_t":
-            return SeviriT(**kwargs)
-        elif name.lower() == "geo_t":
-            return GeoT(**kwargs)
-        elif name.lower() == "geo_ir":
-            return GeoIR(**kwargs)
-        elif name.lower() == "geo_ir_t":
-            return GeoIRT(**kwargs)
-        raise RuntimeError(
-            f"Provided retrieval input name '{name}' is not known."
-        )
+        return _parse_input_config(inpt)
 
     @abstractproperty
     def name(self) -> str:
@@ -177,20 +492,26 @@ class InputConfig(ABC):
         """
 
     @abstractproperty
-    def stats(self) -> xr.Dataset:
+    def stats(self) -> Dict[str, np.ndarray]:
         """
-        xarray.Dataset containing summary statistics for the input.
+        Dictionary containing summary statistics for the input.
         """
 
     def to_dict(self) -> Dict[str, Any]:
         """
         .toml compatible dictionary representation of input config.
         """
-        dct = asdict(self)
+        dct = {}
+        for field in fields(self):
+            value = getattr(self, field.name)
+            if value is None:
+                continue
+            # Configs may be shared between callers so return copies of mutable values.
+            if isinstance(value, (list, dict, np.ndarray)):
+                value = copy(value)
+            dct[field.name] = value
         dct["name"] = self.name
-        return {
-            name: val for name, val in dct.items() if val is not None
-        }
+        return dct
 
     def __hash__(self):
         """
@@ -204,6 +525,8 @@ class PMW(InputConfig):
     """
     InputData record class representing passive-microwave (PMW) observations.
     """
+    __slots__ = ("channels", "include_angles", "normalize", "nan", "_stats", "_ang_stats")
+
     def __init__(
             self,
             channels: Optional[List[int]] = None,
@@ -215,40 +538,35 @@ class PMW(InputConfig):
         Args:
             channels: An optional list of zero-based indices identifying channels to
                 load. If 'None', all channels will be loaded.
-            include_angles: Wether or not to include the eart-incidence angles of the
+            include_angles: Wether or not to include the earth-incidence angles of the
                 observations in the input.
             normalize: An optional string specifying how to normalize the input data.
             nan: An optional float value that will be used to replace missing values
                 in the input data.
         """
-        self.channels = None if channels is None else np.array(channels)
+        self.channels = None if channels is None else np.asarray(channels, dtype=np.int64)
         self.include_angles = include_angles
         self.normalize = normalize
         self.nan = nan
-        self._obs_stats = None
+        self._stats = None
         self._ang_stats = None
 
-    @cached_property
-    def stats(self) -> xr.Dataset:
+    @property
+    def stats(self) -> Dict[str, np.ndarray]:
         """
-        xarray.Dataset containing summary statistics for the input.
+        Dictionary containing summary statistics for the input.
         """
-        stats_file = Path(__file__).parent / "files" / "stats" / f"obs_{self.name}.nc"
-        stats = xr.load_dataset(stats_file, engine="h5netcdf")
-        if self.channels is not None:
-                stats = stats[{"features": self.channels}]
-        return stats
+        if self._stats is None:
+            self._stats = _select_stats(f"obs_{self.name}", self.channels)
+        return self._stats
 
     @property
-    def ang_stats(self) -> xr.Dataset:
+    def ang_stats(self) -> Dict[str, np.ndarray]:
         """
-        xarray.Dataset containing summary statistics for the viewing angles.
+        Dictionary containing summary statistics for the viewing angles.
         """
         if self._ang_stats is None:
-            stats_file = Path(__file__).parent / "files" / "stats" / f"eia_{self.name}.nc"
-            self._ang_stats = xr.load_dataset(stats_file, engine="h5netcdf")
-            if self.channels is not None:
-                self._ang_stats = self._ang_stats[{"features": self.channels}]
+            self._ang_stats = _select_stats(f"eia_{self.name}", self.channels)
         return self._ang_stats
 
     def load_data(self, pmw_data_file: Path, target_time: xr.DataArray) -> Dict[str, np.ndarray]:
@@ -264,33 +582,23 @@ class PMW(InputConfig):
             is 'True' the dictionary will also containg the earth-incidence angles with the
             key 'eia_<sensor_name>'.
         """
-        with open_if_required(pmw_data_file) as pmw_data:
-            pmw_data = pmw_data[["observations", "earth_incidence_angle"]].compute().transpose("channel", ...)
-            obs = pmw_data["observations"].compute().transpose("channel", ...)
-            if self.channels is not None:
-                obs = obs[{"channel": self.channels}]
-            else:
-                obs = obs[{"channel": slice(0, None)}]
-
-            obs = obs.data
-            obs = normalize(obs, self.stats, how=self.normalize, nan=self.nan)
-
-            inpt_data = {
-                f"obs_{self.name}": obs
-            }
-            if self.include_angles:
-                angs = pmw_data["earth_incidence_angle"].compute().transpose("channel", ...)
-                if self.channels is not None:
-                    angs = angs[{"channel": self.channels}]
-                else:
-                    angs = angs[{"channel": slice(0, None)}]
-                angs = normalize(angs.data, self.ang_stats, how=self.normalize, nan=self.nan)
-                inpt_data[f"eia_{self.name}"] = angs
+        indexers = {"channel": slice(None) if self.channels is None else self.channels}
+        dims = ("channel", ...)
+
+        obs = _load_var(pmw_data_file, "observations", indexers, dims)
+        obs = normalize(obs, self.stats, how=self.normalize, nan=self.nan)
+        inpt_data = {
+            f"obs_{self.name}": obs
+        }
+        if self.include_angles:
+            angs = _load_var(pmw_data_file, "earth_incidence_angle", indexers, dims)
+            angs = normalize(angs, self.ang_stats, how=self.normalize, nan=self.nan)
+            inpt_data[f"eia_{self.name}"] = angs
 
         return inpt_data
 
 
-@dataclass
+@dataclass(init=False)
 class ATMS(PMW):
     """
     Retrieval input data from the Advanced Technology Microwave Sounder (ATMS).
@@ -303,29 +611,7 @@ class ATMS(PMW):
     observations and, if 'include_angles' is set to 'True', 'eia_atms' containing the
     earth incidence angles corresponding to the observations in 'obs_atms'.
     """
-    def __init__(
-            self,
-            channels: Optional[List[int]] = None,
-            include_angles: bool = True,
-            normalize: Optional[str] = None,
-            nan: Optional[str] = None
-    ):
-        """
-        Args:
-            channels: An optional list of zero-based indices identifying channels to
-                load. If 'None', all channels will be loaded.
-            include_angles: Wether or not to include the earth-incidence angles of the
-                observations in the input.
-            normalize: An optional string specifying how to normalize the input data.
-            nan: An optional float value that will be used to replace missing values
-                in the input data.
-        """
-        self.channels = channels
-        self.include_angles = include_angles
-        self.normalize = normalize
-        self.nan = nan
-        self._obs_stats = None
-        self._ang_stats = None
+    __slots__ = ()
 
     @property
     def name(self) -> str:
@@ -348,7 +634,7 @@ class ATMS(PMW):
         return features
 
 
-@dataclass
+@dataclass(init=False)
 class GMI(PMW):
     """
     Retrieval input data from the GPM Microwave Imager (GMI).
@@ -361,29 +647,7 @@ class GMI(PMW):
     observations and, if 'include_angles' is set to 'True', 'eia_gmi' containing the
     earth incidence angles corresponding to the observations in 'obs_gmi'.
     """
-    def __init__(
-            self,
-            channels: Optional[List[int]] = None,
-            include_angles: bool = True,
-            normalize: Optional[str] = None,
-            nan: Optional[str] = None
-    ):
-        """
-        Args:
-            channels: An optional list of zero-based indices identifying channels to
-                load. If 'None', all channels will be loaded.
-            include_angles: Wether or not to include the earth-incidence angles of the
-                observations in the input.
-            normalize: An optional string specifying how to normalize the input data.
-            nan: An optional float value that will be used to replace missing values
-                in the input data.
-        """
-        self.channels = channels
-        self.include_angles = include_angles
-        self.normalize = normalize
-        self.nan = nan
-        self._obs_stats = None
-        self._ang_stats = None
+    __slots__ = ()
 
     @property
     def name(self) -> str:
@@ -418,6 +682,8 @@ class Ancillary(InputConfig):
     load the ancillary data and include it in the retrieval input data as a
     variable named 'ancillary'.
     """
+    __slots__ = ("variables", "normalize", "nan", "_stats")
+
     def __init__(
             self,
             variables: Optional[List[str]] = None,
@@ -442,20 +708,21 @@ class Ancillary(InputConfig):
         self.variables = variables
         self.normalize = normalize
         self.nan = nan
+        self._stats = None
 
     @property
     def name(self) -> str:
         return "ancillary"
 
-    @cached_property
-    def stats(self) -> xr.Dataset:
+    @property
+    def stats(self) -> Dict[str, np.ndarray]:
         """
-        xarray.Dataset containing summary statistics for the input.
+        Dictionary containing summary statistics for the input.
         """
-        stats_file = Path(__file__).parent / "files" / "stats" / "ancillary.nc"
-        inds = [ind for ind, var in enumerate(ANCILLARY_VARIABLES) if var in self.variables]
-        stats = xr.load_dataset(stats_file, engine="h5netcdf")[{"features": inds}]
-        return stats
+        if self._stats is None:
+            inds = [ind for ind, var in enumerate(ANCILLARY_VARIABLES) if var in self.variables]
+            self._stats = _select_stats("ancillary", inds)
+        return self._stats
 
     def load_data(self, ancillary_data_file: Path, target_time: xr.DataArray) -> xr.Dataset:
         """
@@ -469,13 +736,21 @@ class Ancillary(InputConfig):
             A dicitonary mapping the single key 'ancillary' to an array containing the data from
             all ancillary variables stacked along the first axis.
         """
-        with open_if_required(ancillary_data_file) as ancillary_data:
-            data = []
-            for var in self.variables:
-                data.append(ancillary_data[var].data)
-
-        data = np.stack(data)
-        data = normalize(np.stack(data), self.stats, how=self.normalize, nan=self.nan)
+        if isinstance(ancillary_data_file, (str, Path)):
+            ancillary_data = xr.open_dataset(ancillary_data_file)
+        else:
+            ancillary_data = ancillary_data_file
+
+        try:
+            shape = ancillary_data[self.variables[0]].shape
+            data = np.empty((len(self.variables),) + shape, dtype=np.float32)
+            for ind, var in enumerate(self.variables):
+                data[ind] = ancillary_data[var].data
+        finally:
+            if ancillary_data is not ancillary_data_file:
+                ancillary_data.close()
+
+        data = normalize(data, self.stats, how=self.normalize, nan=self.nan, out=data)
         return {"ancillary": data}
 
     @property
@@ -493,6 +768,8 @@ class GeoIR(InputConfig):
     The GeoIR loads input data from IR-window channel observations interpolated in time to
     be closest to the nominal time of the precipitation estimates.
     """
+    __slots__ = ("normalize", "nan", "_stats")
+
     def __init__(
             self,
             normalize: Optional[str] = None,
@@ -506,19 +783,20 @@ class GeoIR(InputConfig):
         """
         self.normalize = normalize
         self.nan = nan
+        self._stats = None
 
     @property
     def name(self) -> str:
         return "geo_ir"
 
-    @cached_property
-    def stats(self) -> xr.Dataset:
+    @property
+    def stats(self) -> Dict[str, np.ndarray]:
         """
-        xarray.Dataset containing summary statistics for the input.
+        Dictionary containing summary statistics for the input.
         """
-        stats_file = Path(__file__).parent / "files" / "stats" / "obs_geo_ir.nc"
-        stats = xr.load_dataset(stats_file, engine="h5netcdf")[{"features": 8}]
-        return stats
+        if self._stats is None:
+            self._stats = _select_stats("obs_geo_ir", 8)
+        return self._stats
 
     def load_data(self, geo_data_file: Path, target_time: xr.DataArray) -> xr.Dataset:
         """
@@ -534,9 +812,7 @@ class GeoIR(InputConfig):
             A dicitonary mapping the single key 'obs_geo' to an array containing the GEO IR
             observation from the desired time steps.
         """
-        with open_if_required(geo_data_file) as geo_data:
-            obs = geo_data.observations.data[None]
-
+        obs = _load_var(geo_data_file, "observations")[None]
         obs = normalize(obs, self.stats, how=self.normalize, nan=self.nan)
         return {"obs_geo_ir": obs}
 
@@ -559,6 +835,8 @@ class GeoIRT(InputConfig):
     steps as well as only loading the nearest observations for every reference
     data pixel.
     """
+    __slots__ = ("time_steps", "normalize", "nan", "_stats")
+
     time_steps: List[int]
 
     def __init__(
@@ -587,22 +865,20 @@ class GeoIRT(InputConfig):
         self.time_steps = time_steps
         self.normalize = normalize
         self.nan = nan
+        self._stats = None
 
     @property
     def name(self) -> str:
         return "geo_ir_t"
 
-    @cached_property
-    def stats(self) -> xr.Dataset:
+    @property
+    def stats(self) -> Dict[str, np.ndarray]:
         """
-        xarray.Dataset containing summary statistics for the input.
+        Dictionary containing summary statistics for the input.
         """
-        stats_file = Path(__file__).parent / "files" / "stats" / "obs_geo_ir.nc"
-        stats = xr.load_dataset(stats_file, engine="h5netcdf")[{"features": self.time_steps}]
-        stats = xr.concat([stats for _ in range(len(self.time_steps))], dim="steps")
-        stats = stats.rename(features="features_single").stack(features=("steps", "features_single"))
-        stats = stats.reset_index("features")
-        return stats
+        if self._stats is None:
+            self._stats = _select_stats("obs_geo_ir", self.time_steps)
+        return self._stats
 
     def load_data(self, geo_data_file: Path, target_time: xr.DataArray) -> xr.Dataset:
         """
@@ -618,10 +894,7 @@ class GeoIRT(InputConfig):
             A dicitonary mapping the single key 'obs_geo' to an array containing the GEO IR
             observation from the desired time steps.
         """
-        with open_if_required(geo_data_file) as geo_data:
-            geo_data = geo_data.transpose("time", ...)
-            obs = geo_data.observations[{"time": self.time_steps}].data
-
+        obs = _load_var(geo_data_file, "observations", {"time": self.time_steps}, ("time", ...))
         obs = normalize(obs, self.stats, how=self.normalize, nan=self.nan)
         return {"obs_geo_ir": obs}
 
@@ -642,12 +915,15 @@ class GeoT(InputConfig):
     The full IR input comprises 2 10-minute observations before the median
     overpass time and 2 after the median overpass time.
     """
+    __slots__ = ("channels", "time_steps", "normalize", "nan", "dtype", "_feature_inds", "_stats")
+
     def __init__(
             self,
             channels: Optional[List[int]] = None,
             time_steps: Optional[List[int]] = None,
             normalize: Optional[str] = None,
-            nan: Optional[float] = None
+            nan: Optional[float] = None,
+            dtype: Optional[str] = None
     ):
         """
         Args:
@@ -659,10 +935,13 @@ class GeoT(InputConfig):
             normalize: An optional string specifying how to normalize the input data.
             nan: An optional float value that will be used to replace missing values
                 in the input data.
+            dtype: An optional floating point type, such as 'float16', to convert the
+                loaded observations to. Reduced precision should only be used for
+                normalized observations.
         """
         if channels is None:
-            channels = range(16)
-        self.channels = channels
+            channels = list(range(16))
+        self.channels = np.asarray(channels, dtype=np.int64)
 
         if time_steps is None:
             time_steps = list(range(7))
@@ -674,22 +953,24 @@ class GeoT(InputConfig):
         self.time_steps = time_steps
         self.normalize = normalize
         self.nan = nan
+        self.dtype = None if dtype is None else np.dtype(dtype)
+        # Indices of the statistics of the time-channel features in the order
+        # in which they are stacked in the loaded observations.
+        self._feature_inds = np.tile(self.channels, len(self.time_steps))
+        self._stats = None
 
     @property
     def name(self) -> str:
         return "geo_t"
 
-    @cached_property
-    def stats(self) -> xr.Dataset:
+    @property
+    def stats(self) -> Dict[str, np.ndarray]:
         """
-        xarray.Dataset containing summary statistics for the input.
+        Dictionary containing summary statistics for the input.
         """
-        stats_file = Path(__file__).parent / "files" / "stats" / "obs_geo.nc"
-        stats = xr.load_dataset(stats_file, engine="h5netcdf")[{"features": self.channels}]
-        stats = xr.concat([stats for _ in range(len(self.time_steps))], dim="steps")
-        stats = stats.rename(features="features_single").stack(features=("steps", "features_single"))
-        stats = stats.reset_index("features")
-        return stats
+        if self._stats is None:
+            self._stats = _select_stats("obs_geo", self._feature_inds)
+        return self._stats
 
     def load_data(self, geo_data_file: Path, target_time: xr.DataArray) -> xr.Dataset:
         """
@@ -706,17 +987,22 @@ class GeoT(InputConfig):
             observation from the desired time steps. The returned array will have the
             time and channel dimensions along the leading axes of the array.
         """
-        with open_if_required(geo_data_file) as geo_data:
-            geo_data = geo_data.compute()
-            geo_data = geo_data.transpose("time", "channel", ...)[{"channel": self.channels}]
-            obs = geo_data.observations[{"time": self.time_steps}].data
-            obs = np.reshape(obs, (-1,) + obs.shape[2:])
-
-            if self.normalize is not None:
-                obs = normalize(obs, self.stats, how=self.normalize, nan=self.nan)
-
-        del geo_data
+        # The observations are stored with the channel dimension last, so a single copy is
+        # required to make them contiguous in (time, channel) order. The stacking of the time
+        # and channel dimensions and the normalization then operate on that copy.
+        obs = _load_var(
+            geo_data_file,
+            "observations",
+            {"time": self.time_steps, "channel": self.channels},
+            ("time", "channel", ...)
+        )
+        obs = np.ascontiguousarray(obs)
+        obs = obs.reshape((-1,) + obs.shape[2:])
+        if self.normalize is not None:
+            obs = normalize(obs, self.stats, how=self.normalize, nan=self.nan, out=obs)
 
+        if self.dtype is not None:
+            obs = obs.astype(self.dtype, copy=False)
         return {"obs_geo": obs}
 
     @property
@@ -737,11 +1023,14 @@ class Geo(InputConfig):
     The full IR input comprises 2 10-minute observations before the median
     overpass time and 2 after the median overpass time.
     """
+    __slots__ = ("channels", "normalize", "nan", "dtype", "_stats")
+
     def __init__(
             self,
             channels: Optional[List[int]] = None,
             normalize: Optional[str] = None,
-            nan: Optional[float] = None
+            nan: Optional[float] = None,
+            dtype: Optional[str] = None
     ):
         """
         Args:
@@ -750,29 +1039,30 @@ class Geo(InputConfig):
             normalize: An optional string specifying how to normalize the input data.
             nan: An optional float value that will be used to replace missing values
                 in the input data.
+            dtype: An optional floating point type, such as 'float16', to convert the
+                loaded observations to. Reduced precision should only be used for
+                normalized observations.
         """
         if channels is None:
             channels = list(range(16))
-        self._channels = np.array(channels)
+        self.channels = np.asarray(channels, dtype=np.int64)
         self.normalize = normalize
         self.nan = nan
+        self.dtype = None if dtype is None else np.dtype(dtype)
+        self._stats = None
 
     @property
     def name(self) -> str:
         return "geo"
 
-    @cached_property
-    def channels(self):
-        return self._channels
-
-    @cached_property
-    def stats(self) -> xr.Dataset:
+    @property
+    def stats(self) -> Dict[str, np.ndarray]:
         """
-        xarray.Dataset containing summary statistics for the input.
+        Dictionary containing summary statistics for the input.
         """
-        stats_file = Path(__file__).parent / "files" / "stats" / "obs_geo.nc"
-        stats = xr.load_dataset(stats_file, engine="h5netcdf")[{"features": self.channels}]
-        return stats
+        if self._stats is None:
+            self._stats = _select_stats("obs_geo", self.channels)
+        return self._stats
 
     def load_data(self, geo_data_file: Path, target_time: xr.DataArray) -> xr.Dataset:
         """
@@ -789,12 +1079,14 @@ class Geo(InputConfig):
             observation from the desired time steps. The returned array will have the
             time and channel dimensions along the leading axes of the array.
         """
-        with open_if_required(geo_data_file) as geo_data:
-            obs = geo_data.observations[{"channel": self.channels}].load()
-            obs = obs.transpose("channel", ...).data.copy()
-        del geo_data
-        obs = normalize(obs, self.stats, how=self.normalize, nan=self.nan)
-        return {"obs_geo": obs.copy()}
+        # Selecting an array of channels returns a copy, so 'obs' can be
+        # normalized in place.
+        obs = _load_var(geo_data_file, "observations", {"channel": self.channels}, ("channel", ...))
+        obs = np.ascontiguousarray(obs)
+        obs = normalize(obs, self.stats, how=self.normalize, nan=self.nan, out=obs)
+        if self.dtype is not None:
+            obs = obs.astype(self.dtype, copy=False)
+        return {"obs_geo": obs}
 
     @property
     def features(self) -> Dict[str, int]:
@@ -811,12 +1103,20 @@ class Seviri(InputConfig):
     """
     Special instance of the Geo class load observations from the SEVIRI sensor of the 'austria' domain.
     """
+    __slots__ = (
+        "channels", "goes_channels", "normalize", "nan", "remap_obs", "dtype", "_lut", "_stats"
+    )
+
+    # Indices of the GOES channels corresponding to the SEVIRI channels.
+    all_goes_channels = np.array([0, 1, 2, 4, 6, 7, 9, 10, 11, 13, 14, 15], dtype=np.int64)
+
     def __init__(
             self,
             channels: Optional[List[int]] = None,
             normalize: Optional[str] = None,
             nan: Optional[float] = None,
-            remap_obs: Optional[bool] = False
+            remap_obs: Optional[bool] = False,
+            dtype: Optional[str] = None
     ):
         """
         Args:
@@ -827,41 +1127,39 @@ class Seviri(InputConfig):
                 in the input data.
             remap_obs: Boolean flag indicatin whether or not to remap the observations to match
                 the distribution of corresponding GOES channels.
+            dtype: An optional floating point type, such as 'float16', to convert the
+                loaded observations to. Reduced precision should only be used for
+                normalized observations.
         """
-        self.all_goes_channels = [0, 1, 2, 4, 6, 7, 9, 10, 11, 13, 14, 15]
         if channels is None:
             channels = list(range(12))
-        self._channels = np.array(channels)
+        self.channels = np.array(channels)
+        self.goes_channels = self.all_goes_channels[self.channels]
         self.normalize = normalize
         self.nan = nan
+        self.dtype = None if dtype is None else np.dtype(dtype)
         self.remap_obs = remap_obs
+        self._lut = None
+        self._stats = None
 
     @property
     def name(self) -> str:
         return "geo"
 
-    @cached_property
-    def channels(self):
-        return self._channels
-
-    @cached_property
-    def goes_channels(self):
-        return [self.all_goes_channels[ind] for ind in self._channels]
-
-    @cached_property
+    @property
     def lut(self) -> xr.Dataset:
-        lut_file = Path(__file__).parent / "files" / "stats" / "seviri_lut.nc"
-        lut = xr.load_dataset(lut_file, engine="h5netcdf")[{"channels": self.channels}]
-        return lut
+        if self._lut is None:
+            self._lut = _load_seviri_lut()[{"channels": self.channels}]
+        return self._lut
 
-    @cached_property
-    def stats(self) -> xr.Dataset:
+    @property
+    def stats(self) -> Dict[str, np.ndarray]:
         """
-        xarray.Dataset containing summary statistics for the input.
+        Dictionary containing summary statistics for the input.
         """
-        stats_file = Path(__file__).parent / "files" / "stats" / "obs_geo.nc"
-        stats = xr.load_dataset(stats_file, engine="h5netcdf")[{"features": self.goes_channels}]
-        return stats
+        if self._stats is None:
+            self._stats = _select_stats("obs_geo", self.goes_channels)
+        return self._stats
 
     def load_data(self, geo_data_file: Path, target_time: xr.DataArray) -> xr.Dataset:
         """
@@ -878,10 +1176,10 @@ class Seviri(InputConfig):
             observation from the desired time steps. The returned array will have the
             time and channel dimensions along the leading axes of the array.
         """
-        with open_if_required(geo_data_file) as geo_data:
-            obs = geo_data.observations[{"channel": self.channels}].load()
-            obs = obs.transpose("channel", ...).data.copy()
-        del geo_data
+        # Selecting an array of channels returns a copy, so 'obs' can be
+        # modified in place.
+        obs = _load_var(geo_data_file, "observations", {"channel": self.channels}, ("channel", ...))
+        obs = np.ascontiguousarray(obs)
 
         if self.remap_obs:
             lut = self.lut
@@ -890,8 +1188,10 @@ class Seviri(InputConfig):
                 obs_r = np.interp(obs_r, lut.p_seviri.data[chan_ind], lut.p_goes.data[chan_ind])
                 obs[chan_ind] = obs_r
 
-        obs = normalize(obs, self.stats, how=self.normalize, nan=self.nan)
-        return {"obs_geo": obs.copy()}
+        obs = normalize(obs, self.stats, how=self.normalize, nan=self.nan, out=obs)
+        if self.dtype is not None:
+            obs = obs.astype(self.dtype, copy=False)
+        return {"obs_geo": obs}
 
     @property
     def features(self) -> Dict[str, int]:
@@ -908,6 +1208,14 @@ class SeviriT(InputConfig):
     """
     Special instance of the Geo class load observations from the SEVIRI sensor of the 'austria' domain.
     """
+    __slots__ = (
+        "channels", "goes_channels", "time_steps", "normalize", "nan", "remap_obs", "dtype",
+        "_feature_inds", "_lut", "_stats"
+    )
+
+    # Indices of the GOES channels corresponding to the SEVIRI channels.
+    all_goes_channels = np.array([0, 1, 2, 4, 6, 7, 9, 10, 11, 13, 14, 15], dtype=np.int64)
+
     def __init__(
             self,
             channels: Optional[List[int]] = None,
@@ -915,6 +1223,7 @@ class SeviriT(InputConfig):
             normalize: Optional[str] = None,
             nan: Optional[float] = None,
             remap_obs: Optional[bool] = False,
+            dtype: Optional[str] = None
     ):
         """
         Args:
@@ -925,47 +1234,45 @@ class SeviriT(InputConfig):
                 in the input data.
             remap_obs: Boolean flag indicatin whether or not to remap the observations to match
                 the distribution of corresponding GOES channels.
+            dtype: An optional floating point type, such as 'float16', to convert the
+                loaded observations to. Reduced precision should only be used for
+                normalized observations.
         """
-        self.all_goes_channels = [0, 1, 2, 4, 6, 7, 9, 10, 11, 13, 14, 15]
         if channels is None:
             channels = list(range(12))
-        self._channels = np.array(channels)
+        self.channels = np.array(channels)
+        self.goes_channels = self.all_goes_channels[self.channels]
         if time_steps is None:
             time_steps = list(range(7))
         self.time_steps = time_steps
         self.normalize = normalize
         self.nan = nan
+        self.dtype = None if dtype is None else np.dtype(dtype)
         self.remap_obs = remap_obs
+        self._lut = None
+        # Indices of the statistics of the time-channel features in the order
+        # in which they are stacked in the loaded observations.
+        self._feature_inds = np.tile(self.goes_channels, len(time_steps))
+        self._stats = None
 
     @property
     def name(self) -> str:
         return "geo_t"
 
-    @cached_property
-    def channels(self):
-        return self._channels
-
-    @cached_property
-    def goes_channels(self):
-        return [self.all_goes_channels[ind] for ind in self._channels]
-
-    @cached_property
+    @property
     def lut(self) -> xr.Dataset:
-        lut_file = Path(__file__).parent / "files" / "stats" / "seviri_lut.nc"
-        lut = xr.load_dataset(lut_file, engine="h5netcdf")[{"channels": self.channels}]
-        return lut
+        if self._lut is None:
+            self._lut = _load_seviri_lut()[{"channels": self.channels}]
+        return self._lut
 
-    @cached_property
-    def stats(self) -> xr.Dataset:
+    @property
+    def stats(self) -> Dict[str, np.ndarray]:
         """
-        xarray.Dataset containing summary statistics for the input.
+        Dictionary containing summary statistics for the input.
         """
-        stats_file = Path(__file__).parent / "files" / "stats" / "obs_geo.nc"
-        stats = xr.load_dataset(stats_file, engine="h5netcdf")[{"features": self.goes_channels}]
-        stats = xr.concat([stats for _ in range(len(self.time_steps))], dim="steps")
-        stats = stats.rename(features="features_single").stack(features=("steps", "features_single"))
-        stats = stats.reset_index("features")
-        return stats
+        if self._stats is None:
+            self._stats = _select_stats("obs_geo", self._feature_inds)
+        return self._stats
 
     def load_data(self, geo_data_file: Path, target_time: xr.DataArray) -> xr.Dataset:
         """
@@ -982,10 +1289,15 @@ class SeviriT(InputConfig):
             observation from the desired time steps. The returned array will have the
             time and channel dimensions along the leading axes of the array.
         """
-        with open_if_required(geo_data_file) as geo_data:
-            obs = geo_data.observations[{"time": self.time_steps, "channel": self.channels}].load()
-            obs = obs.transpose("time", "channel", ...).data.copy()
-        del geo_data
+        # Selecting arrays of time steps and channels returns a copy, so 'obs' can be
+        # modified in place.
+        obs = _load_var(
+            geo_data_file,
+            "observations",
+            {"time": self.time_steps, "channel": self.channels},
+            ("time", "channel", ...)
+        )
+        obs = np.ascontiguousarray(obs)
 
         if self.remap_obs:
             lut = self.lut
@@ -994,8 +1306,10 @@ class SeviriT(InputConfig):
                 obs_r = np.interp(obs_r, lut.p_seviri.data[chan_ind], lut.p_goes.data[chan_ind])
                 obs[:, chan_ind] = obs_r
         obs = obs.reshape((-1,) + obs.shape[-2:])
-        obs = normalize(obs, self.stats, how=self.normalize, nan=self.nan)
-        return {"obs_geo": obs.copy()}
+        obs = normalize(obs, self.stats, how=self.normalize, nan=self.nan, out=obs)
+        if self.dtype is not None:
+            obs = obs.astype(self.dtype, copy=False)
+        return {"obs_geo": obs}
 
     @property
     def features(self) -> Dict[str, int]:
@@ -1007,6 +1321,95 @@ class SeviriT(InputConfig):
         return {"obs_geo": n_chans}
 
 
+# Maps the names of the supported retrieval inputs to the corresponding InputConfig classes.
+_INPUT_CONFIGS = {
+    "gmi": GMI,
+    "atms": ATMS,
+    "ancillary": Ancillary,
+    "geo": Geo,
+    "seviri": Seviri,
+    "seviri_t": SeviriT,
+    "geo_t": GeoT,
+    "geo_ir": GeoIR,
+    "geo_ir_t": GeoIRT,
+}
+
+
+def _to_hashable(value: Any) -> Any:
+    """
+    Convert lists and arrays of input config arguments to tuples.
+    """
+    if isinstance(value, np.ndarray):
+        return tuple(value.tolist())
+    if isinstance(value, (list, tuple, range)):
+        return tuple(_to_hashable(elem) for elem in value)
+    return value
+
+
+def _create_input_config(name: str, kwargs: Dict[str, Any]) -> InputConfig:
+    """
+    Create the input config of the given name, reusing a cached instance if the
+    arguments are hashable.
+    """
+    if name.lower() not in _INPUT_CONFIGS:
+        raise RuntimeError(
+            f"Provided retrieval input name '{name}' is not known."
+        )
+    try:
+        items = tuple(sorted(
+            (key, _to_hashable(value)) for key, value in kwargs.items()
+        ))
+        hash(items)
+    except TypeError:
+        return _INPUT_CONFIGS[name.lower()](**kwargs)
+    return _parse_cached(name.lower(), items)
+
+
+@singledispatch
+def _parse_input_config(inpt: Any) -> InputConfig:
+    """
+    Parse an InputConfig from a string, a dictionary, or an InputConfig object.
+    See 'InputConfig.parse' for details.
+    """
+    raise ValueError(
+        f"Unsupported input for parsing an InputConfig: {inpt}"
+    )
+
+
+@_parse_input_config.register
+def _(inpt: InputConfig) -> InputConfig:
+    return inpt
+
+
+@_parse_input_config.register
+def _(inpt: str) -> InputConfig:
+    return _create_input_config(inpt, {})
+
+
+@_parse_input_config.register
+def _(inpt: dict) -> InputConfig:
+    inpt = copy(inpt)
+    name = inpt.pop("name", None)
+    if name is None:
+        raise ValueError(
+            "If a retrieval input is specified using a dict, it must have an entry "
+            "'name'."
+        )
+    return _create_input_config(name, inpt)
+
+
+@lru_cache(maxsize=256)
+def _parse_cached(name: str, items: Tuple[Tuple[str, Any], ...]) -> InputConfig:
+    """
+    Instantiate and cache the input config of the given name with the given,
+    hashable arguments. Tuples are passed on to the constructor as lists.
+    """
+    kwargs = {
+        key: list(value) if isinstance(value, tuple) else value for key, value in items
+    }
+    return _INPUT_CONFIGS[name](**kwargs)
+
+
 def parse_retrieval_inputs(
         inputs: List[str | Dict[str, Any] | InputConfig]
 ) -> List[InputConfig]:
@@ -1022,7 +1425,7 @@ def parse_retrieval_inputs(
         A list containing the retrieval input configuration represented using
         InputConfig objects.
     """
-    return [InputConfig.parse(inpt) for inpt in inputs]
+    return list(map(_parse_input_config, inputs))
 
 
 def calculate_input_features(
@@ -1038,12 +1441,55 @@ def calculate_input_features(
             features of all inputs stacked along the channel/feature dimension. If 'False',
             returns a dict mapping input names to the corresponding number of features.
     """
-    inputs = parse_retrieval_inputs(inputs)
-    features = {}
-    for inpt in inputs:
-        features.update(inpt.features)
+    keys = tuple(_input_key(inpt) for inpt in inputs)
+    if all(key is not None for key in keys):
+        features = _input_features_cached(keys)
+    else:
+        features = _input_features(parse_retrieval_inputs(inputs))
 
     if stack:
         return sum(features.values())
 
+    return dict(features)
+
+
+def _input_key(inpt: str | Dict[str, Any] | InputConfig) -> Optional[Tuple[str, Tuple]]:
+    """
+    Canonical, hashable representation of a retrieval input given as a string or
+    dictionary. Returns 'None' for InputConfig objects and inputs that cannot
+    be represented as hashable key.
+    """
+    if isinstance(inpt, str):
+        return (inpt, ())
+    if isinstance(inpt, dict):
+        try:
+            items = tuple(sorted(
+                (key, _to_hashable(value)) for key, value in inpt.items() if key != "name"
+            ))
+            key = (inpt["name"], items)
+            hash(key)
+        except (KeyError, TypeError):
+            return None
+        return key
+    return None
+
+
+def _input_features(inputs: List[InputConfig]) -> Dict[str, int]:
+    """
+    Collect the features of a list of parsed retrieval inputs.
+    """
+    features = {}
+    for inpt in inputs:
+        features.update(inpt.features)
     return features
+
+
+@lru_cache(maxsize=128)
+def _input_features_cached(keys: Tuple[Tuple[str, Tuple], ...]) -> Dict[str, int]:
+    """
+    Cached version of '_input_features' for inputs represented by their keys.
+    """
+    return _input_features([
+        InputConfig.parse({"name": name, **dict(items)}) if items else InputConfig.parse(name)
+        for name, items in keys
+    ])
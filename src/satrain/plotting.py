@@ -4,9 +4,12 @@ satrain.plotting
 
 Provides plotting-related functionality.
 """
+from functools import lru_cache
+import hashlib
+import os
 from pathlib import Path
-from typing import List
-import urllib
+from types import ModuleType
+from typing import List, Optional
 
 import matplotlib.pyplot as plt
 from matplotlib.ticker import FixedLocator
@@ -14,10 +17,22 @@ from matplotlib.patches import Rectangle
 import numpy as np
 import pandas as pd
 from PIL import Image
+import requests
 import seaborn as sns
 import xarray as xr
 
 
+@lru_cache(maxsize=None)
+def get_ccrs() -> ModuleType:
+    """
+    Import and return the 'cartopy.crs' module. The import is deferred until the
+    module is first needed because cartopy is an optional dependency that is slow
+    to import.
+    """
+    import cartopy.crs as ccrs
+    return ccrs
+
+
 def set_style():
     """
     Set the SATRAIN matplotlib style.
@@ -31,7 +46,6 @@ def add_ticks(
         left=True,
         bottom=True
 ) -> None:
-    import cartopy.crs as ccrs
     """
     Add tick to cartopy Axes object.
 
@@ -42,6 +56,7 @@ def add_ticks(
         left: Whether or not to draw ticks on the y-axis.
         bottom: Whether or not to draw ticks on the x-axis.
     """
+    ccrs = get_ccrs()
     gl = ax.gridlines(crs=ccrs.PlateCarree(), draw_labels=True, linewidth=0, color='none')
     gl.top_labels = False
     gl.right_labels = False
@@ -78,7 +93,7 @@ def scale_bar(
             object.
         linewidth: The width of the line.
     """
-    import cartopy.crs as ccrs
+    ccrs = get_ccrs()
     lon_min, lon_max, lat_min, lat_max = ax.get_extent(ccrs.PlateCarree())
 
     lon_c = lon_min + (lon_max - lon_min) * location[0]
@@ -93,18 +108,14 @@ def scale_bar(
     x_left = x_c - length / 2
     x_right = x_c  + length / 2
 
-    def to_axes_coords(point):
-        crs = ax.projection
-        p_data = crs.transform_point(*point, src_crs=transverse_merc)
-        return ax.transAxes.inverted().transform(ax.transData.transform(p_data))
-
-    def axes_to_lonlat(point):
-        p_src = ax.transData.inverted().transform(ax.transAxes.transform(point))
-        return ccrs.PlateCarree().transform_point(*p_src, src_crs=ax.projection)
-
-
-    left_ax = to_axes_coords([x_left, y_c])
-    right_ax = to_axes_coords([x_right, y_c])
+    # Transform both end points of the bar to axes coordinates at once.
+    points = ax.projection.transform_points(
+        transverse_merc,
+        np.array([x_left, x_right]),
+        np.array([y_c, y_c])
+    )[:, :2]
+    axes_from_display = ax.transAxes.inverted()
+    left_ax, right_ax = axes_from_display.transform(ax.transData.transform(points))
 
     l_ax = right_ax[0] - left_ax[0]
     l_part = l_ax / parts
@@ -159,30 +170,141 @@ def download_blue_marble(texture_file: Path) -> Path:
     """
     Download the texture file if it doesn't exist.
 
+    The texture is streamed to a '.part' file, which is renamed to 'texture_file'
+    once the download is complete. If a partial download exists, the download is
+    resumed from where it stopped.
+
     Args:
-        url: String specifying the URL of the texture file.
         texture_file: Path object pointing to the file to which to download the texture image.
+
+    Return:
+        The path pointing to the downloaded texture file.
     """
     url = "https://eoimages.gsfc.nasa.gov/images/imagerecords/73000/73751/world.topo.bathy.200407.3x21600x10800.jpg"
-    if not texture_file.exists():
-        urllib.request.urlretrieve(url, texture_file)
+    if texture_file.exists():
+        return texture_file
+
+    part_file = texture_file.with_name(texture_file.name + ".part")
+    headers = {}
+    if part_file.exists() and part_file.stat().st_size > 0:
+        headers["Range"] = f"bytes={part_file.stat().st_size}-"
+
+    with requests.get(url, stream=True, headers=headers, timeout=60) as response:
+        if response.status_code == 416:
+            # The requested range starts at or beyond the end of the resource. The
+            # partial download is only complete if its size matches the total size
+            # reported by the server, otherwise start over.
+            total = response.headers.get("Content-Range", "").rpartition("/")[2]
+            complete = total.isdigit() and int(total) == part_file.stat().st_size
+        else:
+            complete = True
+            response.raise_for_status()
+            mode = "ab" if response.status_code == 206 else "wb"
+            with open(part_file, mode) as output:
+                for chunk in response.iter_content(chunk_size=1 << 20):
+                    output.write(chunk)
+
+    if not complete:
+        part_file.unlink()
+        return download_blue_marble(texture_file)
+
+    os.replace(part_file, texture_file)
     return texture_file
 
 
+# Widths of the downsampled versions of the Blue Marble texture.
+BLUE_MARBLE_LEVELS = [1350, 5400]
+
+
+def get_blue_marble_texture(resolution: float) -> Path:
+    """
+    Get the coarsest version of the Blue Marble texture that resolves the given
+    resolution. Downsampled versions of the texture are created once and stored
+    alongside the full-resolution texture.
+
+    Args:
+        resolution: The resolution of the target area in degrees per pixel.
+
+    Return:
+        A path object pointing to the texture file.
+    """
+    Image.MAX_IMAGE_PIXELS = None   # disables the warning
+    texture_file = Path(".") / "blue_marble_hires.png"
+    for width in BLUE_MARBLE_LEVELS:
+        if 360 / width <= resolution:
+            level_file = texture_file.with_name(f"blue_marble_{width}.png")
+            if level_file.exists():
+                return level_file
+            # The full-resolution texture is only required to build the level.
+            download_blue_marble(texture_file)
+            with Image.open(texture_file) as img:
+                # Let the JPEG decoder downscale the image while decoding.
+                img.draft("RGB", (width, width // 2))
+                img.resize((width, width // 2), Image.LANCZOS).save(level_file)
+            return level_file
+    return download_blue_marble(texture_file)
+
+
 def get_blue_marble(area: "pyresample.AreaDefinition") -> Image:
     """
     Get NASA Blue Marble background image.
+
+    If 'area' is a pyresample.AreaDefinition, the resampled image is cached on
+    disk so that subsequent calls for the same area only need to load it. Other
+    geometries, such as swaths, are resampled on every call.
     """
     from pansat.utils import resample_data
-    Image.MAX_IMAGE_PIXELS = None   # disables the warning
-    texture_file = Path(".") / "blue_marble_hires.png"
-    img = np.array(Image.open(download_blue_marble(texture_file)))
-    lats = np.linspace(90, -90, img.shape[0])
-    lons = np.linspace(-180, 180, img.shape[1])
+    from pyresample.geometry import AreaDefinition
+
+    cache_file = None
+    if isinstance(area, AreaDefinition):
+        area_key = "|".join([
+            area.crs.to_wkt(),
+            repr(tuple(area.shape)),
+            repr(tuple(float(val) for val in area.area_extent))
+        ])
+        area_hash = hashlib.blake2b(area_key.encode(), digest_size=8).hexdigest()
+        cache_file = Path(".") / f"blue_marble_{area_hash}.png"
+        if cache_file.exists():
+            return Image.open(cache_file)
+
+    area_lons, area_lats = area.get_lonlats()
+    valid = np.isfinite(area_lons) * np.isfinite(area_lats)
+    resolution = 360 / BLUE_MARBLE_LEVELS[0]
+    if valid.any():
+        lon_min, lon_max = area_lons[valid].min(), area_lons[valid].max()
+        lat_min, lat_max = area_lats[valid].min(), area_lats[valid].max()
+        resolution = min(
+            (lon_max - lon_min) / area_lons.shape[1],
+            (lat_max - lat_min) / area_lons.shape[0]
+        )
+
+    img = Image.open(get_blue_marble_texture(resolution))
+    # Decode JPEG textures at the lowest resolution that still resolves the area.
+    img.draft("RGB", (int(360 / resolution), int(180 / resolution)))
+    width, height = img.size
+    lats = np.linspace(90, -90, height)
+    lons = np.linspace(-180, 180, width)
+
+    # Crop texture to the bounding box of the area.
+    row_start, row_end, col_start, col_end = 0, height, 0, width
+    if valid.any():
+        margin = 2
+        row_start = max(int((90 - lat_max) / 180 * (height - 1)) - margin, 0)
+        row_end = min(int(np.ceil((90 - lat_min) / 180 * (height - 1))) + margin + 1, height)
+        col_start = max(int((lon_min + 180) / 360 * (width - 1)) - margin, 0)
+        col_end = min(int(np.ceil((lon_max + 180) / 360 * (width - 1))) + margin + 1, width)
+        img = img.crop((col_start, row_start, col_end, row_end))
+
+    img = np.asarray(img, dtype=np.float32)
+    img *= 1.0 / 256.0
     blue_marble = xr.Dataset({
-        "longitude": (("longitude"), lons),
-        "latitude": (("latitude"), lats),
-        "img": (("latitude", "longitude", "channels"), img / 256)
+        "longitude": (("longitude"), lons[col_start:col_end]),
+        "latitude": (("latitude"), lats[row_start:row_end]),
+        "img": (("latitude", "longitude", "channels"), img)
     })
     blue_marble_r = resample_data(blue_marble, area)
-    return Image.fromarray((blue_marble_r.img.data * 255).astype("uint8"))
+    img = Image.fromarray((blue_marble_r.img.data * 255).astype("uint8"))
+    if cache_file is not None:
+        img.save(cache_file)
+    return img
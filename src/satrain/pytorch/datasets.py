@@ -22,7 +22,6 @@ import sys
 import numpy as np
 import torch
 from torch.utils.data import Dataset
-import hdf5plugin
 import xarray as xr
 
 from satrain.data import download_missing, get_local_files
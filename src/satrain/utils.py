@@ -7,11 +7,12 @@ Defines helper functions used throught the satrain package.
 
 from contextlib import contextmanager
 from datetime import datetime
+from functools import lru_cache
 import gc
 from pathlib import Path
-from typing import Union
+from typing import Optional, Union
 
-import hdf5plugin
+import numpy as np
 import xarray as xr
 
 
@@ -41,14 +42,22 @@ def open_if_required(path_or_dataset: str | Path | xr.Dataset) -> xr.Dataset:
         del handle
 
 
+@lru_cache(maxsize=None)
+def _parse_time_stamp(time_stamp: str) -> datetime:
+    """
+    Parse time stamp from SatRain filename. Cached because the same time stamps
+    occur in the filenames of all input sources.
+    """
+    return datetime.strptime(time_stamp, "%Y%m%d%H%M%S")
+
+
 def get_median_time(path: Union[Path, str]) -> datetime:
     """
     Extract median time from filename.
     """
     if isinstance(path, Path):
         path = path.name
-    date = datetime.strptime(path.split("_")[-1][:-3], "%Y%m%d%H%M%S")
-    return date
+    return _parse_time_stamp(path.split("_")[-1][:-3])
 
 
 def cleanup_files(path: Path, no_action: bool = False) -> None:
@@ -108,14 +117,76 @@ def extract_samples(dataset: xr.Dataset, mask: xr.DataArray):
         A new dataset containing only samples with valid reference data.
     """
     dataset = dataset.transpose(*mask.dims, ...)
+    mask_dims = mask.dims
+    mask = np.asarray(mask.data, dtype=bool)
+    # Convert the mask to indices once and gather them from the flattened
+    # spatial dimensions of the variables.
+    indices = np.flatnonzero(mask)
     extracted = xr.Dataset()
     for name in dataset:
         var = dataset[name]
-        if var.dims[:2] == mask.dims:
-            var_e = var.data[mask.data]
+        if var.dims[:2] == mask_dims:
+            data = var.data
+            if isinstance(data, np.ndarray) and data.flags.c_contiguous:
+                var_e = np.take(data.reshape((-1,) + data.shape[2:]), indices, axis=0)
+            else:
+                var_e = data[mask]
             extracted[name] = (("samples",) + var.dims[2:], var_e)
         else:
             extracted[name] = var
     for dim in dataset.dims:
         extracted[dim] = dataset[dim]
     return extracted
+
+
+def convert_to_zarr(
+        netcdf_file: Path,
+        zarr_store: Optional[Path] = None,
+        tile_size: int = 256
+) -> Path:
+    """
+    Convert a SatRain NetCDF4 file to a Zarr store.
+
+    Variables with a 'channel' dimension are chunked with a single channel per
+    chunk and spatial chunks of size 'tile_size' so that loading a subset of the
+    channels only reads the corresponding chunks. The data is compressed using
+    zstd with bit shuffling.
+
+    Args:
+        netcdf_file: A Path object pointing to the NetCDF4 file to convert.
+        zarr_store: The path of the Zarr store to create. If not given, the
+            store is created next to 'netcdf_file' with suffix '.zarr'.
+        tile_size: The size of the chunks along the spatial dimensions.
+
+    Return:
+        A Path object pointing to the created Zarr store.
+    """
+    import zarr
+
+    if int(zarr.__version__.split(".")[0]) >= 3:
+        from zarr.codecs import BloscCodec
+        compression = {
+            "compressors": (BloscCodec(cname="zstd", clevel=3, shuffle="bitshuffle"),)
+        }
+    else:
+        from numcodecs import Blosc
+        compression = {
+            "compressor": Blosc(cname="zstd", clevel=3, shuffle=Blosc.BITSHUFFLE)
+        }
+
+    netcdf_file = Path(netcdf_file)
+    if zarr_store is None:
+        zarr_store = netcdf_file.with_suffix(".zarr")
+
+    with xr.open_dataset(netcdf_file) as data:
+        encoding = {}
+        for name, var in data.data_vars.items():
+            if "channel" not in var.dims:
+                continue
+            chunks = tuple(
+                1 if dim == "channel" else min(tile_size, size)
+                for dim, size in zip(var.dims, var.shape)
+            )
+            encoding[name] = {"chunks": chunks, **compression}
+        data.to_zarr(zarr_store, mode="w", encoding=encoding)
+    return zarr_store
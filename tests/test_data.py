@@ -8,6 +8,7 @@ import pytest
 from satrain.data import (
     enable_testing,
     get_files_in_dataset,
+    get_files_subset,
     get_local_files,
     get_files,
     load_tabular_data
@@ -24,6 +25,118 @@ def test_get_files_in_dataset():
     assert len(files["gmi"]["training"]["xl"]["gridded"]["gmi"]) > len(files["gmi"]["training"]["l"]["gridded"]["gmi"])
 
 
+def test_get_files_subset():
+    """
+    Tests extracting a single branch of the files in the SatRain dataset and ensure that
+    it matches the corresponding branch in the full listing.
+    """
+    files = get_files_in_dataset("satrain")
+    subset = get_files_subset("satrain", ("gmi", "training", "xl", "gridded", "gmi"))
+    assert subset == files["gmi"]["training"]["xl"]["gridded"]["gmi"]
+
+    subset = get_files_subset("satrain", ("gmi", "training", "xl", "gridded", "unknown"))
+    assert subset == []
+
+
+def test_stream_branch():
+    """
+    Ensure that streaming a branch of the manifest stops once the branch has been read.
+    """
+    from satrain.data import _stream_branch
+
+    def events():
+        yield ("", "start_map", None)
+        yield ("", "map_key", "a")
+        yield ("a", "start_map", None)
+        yield ("a", "map_key", "b")
+        yield ("a.b", "start_array", None)
+        yield ("a.b.item", "string", "file_1.nc")
+        yield ("a.b.item", "string", "file_2.nc")
+        yield ("a.b", "end_array", None)
+        yield ("a", "end_map", None)
+        raise AssertionError("Stream consumed beyond the requested branch.")
+
+    assert _stream_branch(events(), ("a", "b")) == ["file_1.nc", "file_2.nc"]
+    assert _stream_branch(events(), ("a", "c")) == []
+
+
+def test_download_file_failure(tmp_path):
+    """
+    Ensure that a failed download leaves neither a partial file nor a temporary file behind.
+    """
+    from satrain.data import download_file
+
+    class FailingRaw:
+        decode_content = False
+
+        def __init__(self):
+            self.calls = 0
+
+        def read(self, *args):
+            self.calls += 1
+            if self.calls > 1:
+                raise IOError("Connection lost.")
+            return b"\x01" * 16
+
+    class Response:
+        headers = {"Content-Length": "1024"}
+        raw = FailingRaw()
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *args):
+            pass
+
+        def raise_for_status(self):
+            pass
+
+    class Session:
+        def get(self, url, **kwargs):
+            return Response()
+
+    destination = tmp_path / "gmi_20200101000000.nc"
+    with pytest.raises(IOError):
+        download_file("https://example.com/file.nc", destination, session=Session())
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_download_file_mode(tmp_path):
+    """
+    Ensure that the permissions of downloaded files follow the umask.
+    """
+    import io
+    import stat
+    from satrain.data import download_file
+
+    class Response:
+        headers = {"Content-Length": "4"}
+        raw = io.BytesIO(b"data")
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *args):
+            pass
+
+        def raise_for_status(self):
+            pass
+
+    class Session:
+        def get(self, url, **kwargs):
+            return Response()
+
+    destination = tmp_path / "gmi_20200101000000.nc"
+    umask = os.umask(0o022)
+    try:
+        download_file("https://example.com/file.nc", destination, session=Session())
+    finally:
+        os.umask(umask)
+    assert destination.read_bytes() == b"data"
+    assert stat.S_IMODE(destination.stat().st_mode) == 0o644
+    assert list(tmp_path.iterdir()) == [destination]
+
+
 @pytest.mark.parametrize("sensor_and_fixture", [["gmi", "satrain_gmi_gridded_train"], ["atms", "satrain_atms_gridded_train"]])
 def test_download_files_satrain_gmi_gridded_train(request, sensor_and_fixture):
     """
@@ -14,6 +14,10 @@ from satrain.input import (
     InputConfig,
     GMI,
     Ancillary,
+    GeoIRT,
+    Geo,
+    GeoT,
+    Seviri,
     calculate_input_features,
 )
 
@@ -45,6 +49,163 @@ def test_normalize():
     assert np.isclose(data_n.min(), -1.5)
 
 
+def test_normalize_out():
+    """
+    Test normalization of input data into a given output array and ensure that
+    the data type of float32 input is preserved.
+    """
+    data = np.random.rand(2, 64, 64).astype(np.float32)
+    data[0, 0, 0] = np.nan
+    stats = xr.Dataset({
+        "min": (("features",), [0.0, 0.0]),
+        "max": (("features",), [1.0, 2.0]),
+        "mean": (("features",), [0.5, 1.0]),
+        "std_dev": (("features",), [1.0, 2.0]),
+    })
+
+    data_n = normalize(data, stats, "standardize")
+    assert data_n.dtype == np.float32
+    assert data_n is not data
+    assert np.isclose(data_n[1], (data[1] - 1.0) / 2.0, rtol=1e-4).all()
+
+    data_n = normalize(data, stats, "minmax", nan=-1.5, out=data)
+    assert data_n is data
+    assert data[0, 0, 0] == -1.5
+    assert (data <= 1.0).all()
+
+    data = np.random.rand(2, 64, 64)
+    data_n = normalize(data, stats, "standardize", dtype=np.float32)
+    assert data_n.dtype == np.float32
+    assert np.isclose(data_n[1], (data[1] - 1.0) / 2.0, rtol=1e-4).all()
+
+    data_n = normalize(data, stats)
+    assert data_n is data
+
+
+@pytest.mark.parametrize("how", ["standardize", "minmax"])
+def test_normalize_integer(how):
+    """
+    Test normalization of integer data and ensure that it is converted to float32 and
+    matches the normalization of the corresponding floating point data.
+    """
+    data = np.random.randint(0, 256, size=(2, 32, 32)).astype(np.uint8)
+    stats = xr.Dataset({
+        "min": (("features",), [0.0, 10.0]),
+        "max": (("features",), [255.0, 200.0]),
+        "mean": (("features",), [100.0, 120.0]),
+        "std_dev": (("features",), [50.0, 20.0]),
+    })
+    data_n = normalize(data, stats, how)
+    data_ref = normalize(data.astype(np.float32), stats, how)
+    assert data_n.dtype == np.float32
+    assert np.isclose(data_n, data_ref, rtol=1e-5).all()
+
+    stats = xr.Dataset({"min": 0.0, "max": 255.0, "mean": 100.0, "std_dev": 50.0})
+    data_n = normalize(data, stats, how)
+    data_ref = normalize(data.astype(np.float32), stats, how)
+    assert np.isclose(data_n, data_ref, rtol=1e-5).all()
+
+
+def test_stats():
+    """
+    Ensure that the statistics of inputs match the number of loaded features.
+    """
+    cfg = GMI(channels=[0, 3])
+    assert cfg.stats["mean"].shape == (2,)
+    assert cfg.stats["mean"].dtype == np.float32
+
+    cfg = GeoIRT(time_steps=[0, 4, 8])
+    assert cfg.stats["mean"].shape == (3,)
+
+    cfg = GeoT(channels=[0, 1], time_steps=[0, 1, 2])
+    assert cfg.stats["mean"].shape == (6,)
+    assert np.array_equal(cfg.stats["min"][:2], cfg.stats["min"][2:4])
+
+    cfg = Seviri(channels=[3, 0])
+    cfg_geo = Geo(channels=[4, 0])
+    assert cfg.stats["mean"].shape == (2,)
+    assert np.array_equal(cfg.stats["mean"], cfg_geo.stats["mean"])
+
+
+def test_slots():
+    """
+    Ensure that input configs don't carry an instance dictionary and can be pickled.
+    """
+    import pickle
+    for cfg in [GMI(channels=[0, 1]), Ancillary(), GeoIRT(time_steps=[0]), Geo(), Seviri()]:
+        assert not hasattr(cfg, "__dict__")
+        cfg.stats
+        cfg_p = pickle.loads(pickle.dumps(cfg))
+        assert np.array_equal(cfg_p.stats["max"], cfg.stats["max"])
+
+
+def test_stats_shared():
+    """
+    Ensure that the GEO statistics file is loaded only once for all GEO inputs.
+    """
+    from satrain.input import _load_stats, _select_stats_cached
+    _select_stats_cached.cache_clear()
+    _load_stats.cache_clear()
+    Geo(channels=[0, 1]).stats
+    Seviri(channels=[2]).stats
+    GeoT(channels=[3], time_steps=[0, 1]).stats
+    assert _load_stats.cache_info().misses == 1
+
+
+def test_load_data_from_file(tmp_path):
+    """
+    Ensure that loading input data from a file matches loading it from the
+    corresponding dataset.
+    """
+    obs = np.random.uniform(100, 300, size=(32, 32, 13))
+    obs[0, 0] = np.nan
+    data = xr.Dataset({
+        "observations": (("latitude", "longitude", "channel"), obs),
+        "earth_incidence_angle": (("latitude", "longitude", "channel"), obs / 5.0),
+    })
+    encoding = {"observations": {"dtype": "uint16", "scale_factor": 0.01, "_FillValue": 65535}}
+    data.to_netcdf(tmp_path / "gmi.nc", encoding=encoding)
+
+    cfg = GMI(channels=[5, 0, 3])
+    inpt_file = cfg.load_data(tmp_path / "gmi.nc", target_time=None)
+    inpt_data = cfg.load_data(xr.load_dataset(tmp_path / "gmi.nc"), target_time=None)
+    for name in ["obs_gmi", "eia_gmi"]:
+        assert inpt_file[name].shape == (3, 32, 32)
+        assert np.array_equal(inpt_file[name], inpt_data[name], equal_nan=True)
+    assert np.isnan(inpt_file["obs_gmi"][:, 0, 0]).all()
+
+    # Files chunked by channel are read using sparse channel selections.
+    encoding["observations"]["chunksizes"] = (32, 32, 1)
+    data.to_netcdf(tmp_path / "gmi_chunked.nc", encoding=encoding)
+    cfg = GMI(channels=[9, 0, 3, 0])
+    inpt_file = cfg.load_data(tmp_path / "gmi_chunked.nc", target_time=None)
+    inpt_data = cfg.load_data(xr.load_dataset(tmp_path / "gmi_chunked.nc"), target_time=None)
+    assert np.array_equal(inpt_file["obs_gmi"], inpt_data["obs_gmi"], equal_nan=True)
+
+    # Negative indices select channels from the end as for in-memory datasets.
+    for path in [tmp_path / "gmi.nc", tmp_path / "gmi_chunked.nc"]:
+        cfg = GMI(channels=[-1, 0, -4])
+        inpt_file = cfg.load_data(path, target_time=None)
+        inpt_data = cfg.load_data(xr.load_dataset(path), target_time=None)
+        assert np.array_equal(inpt_file["obs_gmi"], inpt_data["obs_gmi"], equal_nan=True)
+        assert np.allclose(inpt_file["obs_gmi"][0], obs[..., 12], atol=0.01, equal_nan=True)
+
+
+def test_load_data_dtype():
+    """
+    Ensure that GEO observations are converted to the requested dtype.
+    """
+    obs = np.random.uniform(200, 300, size=(32, 32, 16))
+    data = xr.Dataset({"observations": (("latitude", "longitude", "channel"), obs)})
+
+    cfg = Geo(channels=[0, 8], normalize="minmax")
+    cfg_f16 = Geo(channels=[0, 8], normalize="minmax", dtype="float16")
+    obs_ref = cfg.load_data(data, target_time=None)["obs_geo"]
+    obs_f16 = cfg_f16.load_data(data, target_time=None)["obs_geo"]
+    assert obs_f16.dtype == np.float16
+    assert np.allclose(obs_f16, obs_ref, rtol=1e-2, atol=1e-2)
+
+
 def test_parsing():
     """
     Test parsing of input data configs.
@@ -53,13 +214,23 @@ def test_parsing():
     cfg = InputConfig.parse(inpt)
     assert isinstance(cfg, GMI)
 
+    assert InputConfig.parse(inpt) is cfg
+
     inpt = {"name": "GMI", "channels": [0, 1]}
     cfg = InputConfig.parse(inpt)
     assert isinstance(cfg, GMI)
+    assert InputConfig.parse({"name": "gmi", "channels": (0, 1)}) is cfg
+    assert InputConfig.parse("gmi") is not cfg
 
     cfg = GMI(channels=[0, 1])
     assert isinstance(cfg, GMI)
 
+    # Parsed configs are shared, so exported dicts must not alias their values.
+    dct = InputConfig.parse("geo_ir_t").to_dict()
+    time_steps = list(dct["time_steps"])
+    dct["time_steps"].append(99)
+    assert InputConfig.parse("geo_ir_t").time_steps == time_steps
+
     inpt = "ancillary"
     cfg = InputConfig.parse(inpt)
     assert isinstance(cfg, Ancillary)
@@ -260,3 +431,8 @@ def test_calculate_input_features(sensor):
 
     features = calculate_input_features(inputs, stack=True)
     assert features == 12
+
+    # Cached results must not be affected by changes to the returned dicts.
+    features = calculate_input_features(inputs, stack=False)
+    features["obs_geo"] = 0
+    assert calculate_input_features(inputs, stack=False)["obs_geo"] == 3
@@ -3,10 +3,11 @@ Tests for the satrain.utils module.
 """
 
 import numpy as np
+import pytest
 import xarray as xr
 
 
-from satrain.utils import open_if_required
+from satrain.utils import convert_to_zarr, extract_samples, open_if_required
 
 
 def test_open_if_required(tmp_path):
@@ -27,3 +28,42 @@ def test_open_if_required(tmp_path):
         data_not_loaded = data.surface_precip
 
     assert np.all(data_not_loaded.data == test_data.surface_precip.data)
+
+
+def test_extract_samples():
+    """
+    Test extraction of valid samples from contiguous and transposed variables.
+    """
+    dataset = xr.Dataset({
+        "obs": (("y", "x", "channel"), np.random.rand(16, 12, 3)),
+        "surface_precip": (("x", "y"), np.random.rand(12, 16)),
+    })
+    mask = xr.DataArray(np.random.rand(16, 12) > 0.5, dims=("y", "x"))
+
+    extracted = extract_samples(dataset, mask)
+    assert np.array_equal(extracted.obs.data, dataset.obs.data[mask.data])
+    assert np.array_equal(
+        extracted.surface_precip.data, dataset.surface_precip.data.T[mask.data]
+    )
+
+
+def test_convert_to_zarr(tmp_path):
+    """
+    Test conversion of NetCDF4 files to Zarr stores and loading input data from them.
+    """
+    pytest.importorskip("zarr")
+    from satrain.input import Geo
+
+    obs = np.random.uniform(200, 300, size=(32, 32, 16))
+    data = xr.Dataset({"observations": (("latitude", "longitude", "channel"), obs)})
+    data.to_netcdf(tmp_path / "geo.nc")
+
+    zarr_store = convert_to_zarr(tmp_path / "geo.nc", tile_size=16)
+    assert zarr_store == tmp_path / "geo.zarr"
+    with xr.open_zarr(zarr_store) as data_zarr:
+        assert data_zarr.observations.encoding["chunks"] == (16, 16, 1)
+
+    cfg = Geo(channels=[3, 0], normalize="minmax")
+    obs_nc = cfg.load_data(tmp_path / "geo.nc", target_time=None)["obs_geo"]
+    obs_zarr = cfg.load_data(zarr_store, target_time=None)["obs_geo"]
+    assert np.array_equal(obs_nc, obs_zarr)